@@ -0,0 +1 @@
+"""Headless benchmarks for the Real Estate Loan Calculator."""
@@ -0,0 +1,275 @@
+"""Headless benchmark suite for the calculation engines and state serialization.
+
+Run from the repository root:
+
+    python -m benchmarks.run --output bench_output.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Every result is written to a JSON file. With ``--baseline`` each result is
+compared against the stored run and the process exits with status 1 when a
+timing grows beyond ``--time-tolerance`` or a size beyond
+``--size-tolerance`` (ratios against the baseline).
+"""
+
+import argparse
+import gzip
+import json
+import pickle
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import reflex as rx
+from reflex.utils import format
+
+import real_estate_reflex.real_estate_reflex as app_module
+from real_estate_reflex.components.figures import balance_figure, principal_interest_figure
+from real_estate_reflex.engine import cache
+from real_estate_reflex.engine.amortization import amortization_schedule, monthly_payment
+from real_estate_reflex.engine.charts import scenario_overlay_series, schedule_chart_series
+from real_estate_reflex.engine.export import gzip_chunks, iter_schedule_csv
+from real_estate_reflex.engine.sensitivity import sensitivity_grid
+
+TERMS = (1, 5, 10, 15, 20, 25, 30, 40, 50)
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def clear_caches():
+    """Empty the process-wide result caches so a benchmark measures cold computation."""
+    for lru in cache.CACHES.values():
+        lru.clear()
+
+
+def state_tree():
+    """A detached root state with its substates, as the app would create per session."""
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(app_module.State.get_full_name().split(".")[1:])
+    return root, state
+
+
+def substate(root: rx.State, state_class: type) -> rx.State:
+    """Fetch one substate of a detached state tree."""
+    return root.get_substate(state_class.get_full_name().split(".")[1:])
+
+
+def time_call(fn: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """Time ``repeat`` calls of ``fn`` (running ``setup`` untimed before each) in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return {
+        "kind": "time",
+        "unit": "us",
+        "value": statistics.median(samples),
+        "min": min(samples),
+        "repeat": repeat,
+    }
+
+
+def size_of(nbytes: int) -> Dict[str, Any]:
+    return {"kind": "size", "unit": "bytes", "value": nbytes}
+
+
+def bench_payment(results: Results, repeat: int):
+    """calculate_monthly_payment through the state (cached) and the raw formula."""
+    _, state = state_tree()
+    results["calculate_monthly_payment.cached"] = time_call(
+        lambda: state.calculate_monthly_payment(250000.0, 5.0, 30), repeat
+    )
+    results["calculate_monthly_payment.cold"] = time_call(
+        lambda: state.calculate_monthly_payment(250000.0, 5.0, 30), repeat, setup=clear_caches
+    )
+    results["monthly_payment.formula"] = time_call(lambda: monthly_payment(250000.0, 5.0, 30), repeat)
+
+
+def bench_calculate_loan(results: Results, repeat: int):
+    """calculate_loan and the full schedule build for terms from 1 to 50 years."""
+    _, state = state_tree()
+    state.loan_amount, state.annual_interest_rate = 250000.0, 5.0
+    for years in TERMS:
+        state.loan_term_years = years
+        results[f"calculate_loan.{years}y"] = time_call(state.calculate_loan, repeat, setup=clear_caches)
+        results[f"amortization_schedule.{years}y"] = time_call(
+            lambda: amortization_schedule(250000.0, 5.0, years), repeat
+        )
+
+    def sweep():
+        for years in range(1, 51):
+            state.loan_term_years = years
+            state.calculate_loan()
+
+    results["calculate_loan.sweep_1_50y"] = time_call(sweep, max(1, repeat // 10), setup=clear_caches)
+
+
+def bench_compare_scenarios(results: Results, repeat: int):
+    """compare_scenarios for the default pair and for a full list of scenarios."""
+    root, _ = state_tree()
+    comparison = substate(root, app_module.ComparisonState)
+    results["compare_scenarios.2"] = time_call(comparison.compare_scenarios, repeat, setup=clear_caches)
+
+    while len(comparison.scenarios) < app_module.MAX_SCENARIOS:
+        comparison.add_scenario()
+    for position, scenario in enumerate(comparison.scenarios):
+        scenario["interest_rate"] = 3.0 + position * 0.125
+        scenario["term_years"] = 10 + position % 41
+    results[f"compare_scenarios.{app_module.MAX_SCENARIOS}"] = time_call(
+        comparison.compare_scenarios, repeat, setup=clear_caches
+    )
+    results[f"scenario_overlay_series.{app_module.MAX_SCENARIOS}"] = time_call(
+        lambda: scenario_overlay_series(
+            [scenario["loan_amount"] for scenario in comparison.scenarios],
+            [scenario["interest_rate"] for scenario in comparison.scenarios],
+            [scenario["term_years"] for scenario in comparison.scenarios],
+        ),
+        repeat,
+    )
+
+
+def bench_export(results: Results, repeat: int):
+    """download_csv and the streamed CSV export behind it, for a 50-year schedule."""
+    _, state = state_tree()
+    state.loan_term_years = 50
+    state.calculate_loan()
+    results["download_csv"] = time_call(state.download_csv, repeat)
+
+    schedule = amortization_schedule(250000.0, 5.0, 50)
+    csv_bytes = b"".join(iter_schedule_csv(schedule))
+    results["export.csv.50y"] = time_call(lambda: b"".join(iter_schedule_csv(schedule)), repeat)
+    results["export.csv_gzip.50y"] = time_call(lambda: b"".join(gzip_chunks(iter_schedule_csv(schedule))), repeat)
+    results["export.csv.50y.bytes"] = size_of(len(csv_bytes))
+    results["export.csv_gzip.50y.bytes"] = size_of(len(gzip.compress(csv_bytes)))
+
+
+def bench_charts(results: Results, repeat: int):
+    """Chart-series generators and the figures built from them."""
+    schedule = amortization_schedule(250000.0, 5.0, 50)
+    results["schedule_chart_series.50y"] = time_call(lambda: schedule_chart_series(schedule), repeat)
+    results["sensitivity_grid"] = time_call(lambda: sensitivity_grid(250000.0), repeat)
+
+    def build_figures():
+        series = cache.cached_chart_series(250000.0, 5.0, 50)
+        return principal_interest_figure(series), balance_figure(series)
+
+    results["schedule_figures.50y"] = time_call(build_figures, repeat, setup=clear_caches)
+    series = schedule_chart_series(schedule)
+    results["schedule_figures.50y.bytes"] = size_of(len(format.json_dumps({
+        "principal_interest_chart": principal_interest_figure(series),
+        "balance_chart": balance_figure(series),
+    })))
+
+
+def bench_state_delta(results: Results, repeat: int):
+    """Size and serialization time of the state delta sent after a recalculation."""
+    root, state = state_tree()
+    amounts = iter(np.linspace(100000, 900000, 100000))
+
+    def recalculate():
+        root._clean()
+        state.loan_amount = float(next(amounts))
+        state.calculate_loan()
+
+    recalculate()
+    delta = root.get_delta()
+    results["state_delta.recalc.bytes"] = size_of(len(format.json_dumps(delta)))
+
+    results["state_delta.recalc"] = time_call(
+        lambda: format.json_dumps(root.get_delta()), repeat, setup=recalculate
+    )
+    results["state_pickle.bytes"] = size_of(len(pickle.dumps(root)))
+    results["state_pickle.serialize"] = time_call(lambda: pickle.dumps(root), repeat)
+
+
+BENCHMARKS = (
+    bench_payment,
+    bench_calculate_loan,
+    bench_compare_scenarios,
+    bench_export,
+    bench_charts,
+    bench_state_delta,
+)
+
+
+def run_benchmarks(repeat: int) -> Dict[str, Any]:
+    """Run every benchmark and return the results with details of the environment."""
+    results: Results = {}
+    for benchmark in BENCHMARKS:
+        benchmark(results, repeat)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "reflex": rx.constants.Reflex.VERSION,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    report: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float, size_tolerance: float
+) -> List[str]:
+    """Describe every result that regressed beyond its tolerance against the baseline."""
+    regressions = []
+    for name, result in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or previous["value"] <= 0:
+            continue
+        ratio = result["value"] / previous["value"]
+        result["baseline"] = previous["value"]
+        result["ratio"] = round(ratio, 3)
+        tolerance = time_tolerance if result["kind"] == "time" else size_tolerance
+        if ratio > tolerance:
+            regressions.append(
+                f"{name}: {result['value']:.1f} {result['unit']} vs baseline {previous['value']:.1f} "
+                f"({ratio:.2f}x, tolerance {tolerance:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"), help="where to write the results")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="also write the results to this baseline file")
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per benchmark")
+    parser.add_argument("--time-tolerance", type=float, default=1.5, help="allowed timing ratio against the baseline")
+    parser.add_argument("--size-tolerance", type=float, default=1.05, help="allowed size ratio against the baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.repeat)
+    regressions = []
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_to_baseline(report, baseline, args.time_tolerance, args.size_tolerance)
+    report["regressions"] = regressions
+
+    args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(report, indent=2))
+
+    for name, result in report["results"].items():
+        ratio = f"  ({result['ratio']:.2f}x)" if "ratio" in result else ""
+        print(f"{name:<40} {result['value']:>14.1f} {result['unit']}{ratio}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Import-time and first-event profile of a fresh app worker.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --output startup_output.json
+    python -m benchmarks.startup --save-baseline benchmarks/startup_baseline.json
+    python -m benchmarks.startup --baseline benchmarks/startup_baseline.json
+
+Every measurement runs in a new interpreter, as a scaled-out worker would:
+``python -X importtime`` for the app module, broken down by top-level
+package, the time to serve the first ``calculate_loan`` event with its
+charts, both cold and after the startup warm-up (``warm_up``), and the time
+to compile every page as ``reflex export`` does. Results use the format of
+``benchmarks.run`` and are checked against a baseline the same way.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+APP_MODULE = "real_estate_reflex.real_estate_reflex"
+
+# Heaviest top-level packages listed in the report
+TOP_PACKAGES = 15
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter from the repository root."""
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent.parent
+    )
+
+
+def import_profile() -> Dict[str, Any]:
+    """Self time per top-level package and the total, in microseconds, from one ``-X importtime`` run."""
+    stderr = run_python("-X", "importtime", "-c", f"import {APP_MODULE}").stderr
+    packages: Dict[str, int] = defaultdict(int)
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+        if name.strip() == APP_MODULE:
+            total = int(cumulative_us)
+    return {"total": total, "packages": dict(packages)}
+
+
+def probe_first_event(warm: bool):
+    """Print, as JSON, the import and first-event times of this interpreter in microseconds.
+
+    Runs in the child interpreter started by ``first_event_profile``, so
+    this module imports nothing from the app at its top.
+    """
+    import time
+
+    start = time.perf_counter_ns()
+    import real_estate_reflex.real_estate_reflex as app_module
+    imported = time.perf_counter_ns()
+    if warm:
+        app_module.warm_up()
+    warmed = time.perf_counter_ns()
+
+    from benchmarks.run import state_tree, substate
+
+    root, state = state_tree()
+    schedule = substate(root, app_module.ScheduleState)
+    schedule.charts_visible = True
+    event_start = time.perf_counter_ns()
+    state.calculate_loan()
+    charts = (schedule.principal_interest_chart, schedule.balance_chart)
+    event_end = time.perf_counter_ns()
+    print(json.dumps({
+        "import": (imported - start) / 1000,
+        "warm_up": (warmed - imported) / 1000,
+        "first_event": (event_end - event_start) / 1000,
+        "charts": len(charts),
+    }))
+
+
+def first_event_profile(warm: bool) -> Dict[str, float]:
+    stdout = run_python("-c", f"from benchmarks.startup import probe_first_event; probe_first_event({warm})").stdout
+    return json.loads(stdout.splitlines()[-1])
+
+
+def probe_compile():
+    """Print, as JSON, the time to compile every page of the app in microseconds.
+
+    Runs in the child interpreter started by ``compile_profile``. This is
+    the page compile of ``reflex export`` without its frontend package
+    install and JavaScript build, so it needs neither bun nor the network.
+    """
+    import time
+
+    from reflex.utils import prerequisites
+
+    app = prerequisites.get_and_validate_app().app
+    start = time.perf_counter_ns()
+    app._compile(export=True, dry_run=True)
+    end = time.perf_counter_ns()
+    print(json.dumps({"compile": (end - start) / 1000, "pages": len(app._pages)}))
+
+
+def compile_profile() -> Dict[str, float]:
+    stdout = run_python("-c", "from benchmarks.startup import probe_compile; probe_compile()").stdout
+    return json.loads(stdout.splitlines()[-1])
+
+
+def timing(samples: List[float]) -> Dict[str, Any]:
+    return {"kind": "time", "unit": "us", "value": statistics.median(samples), "min": min(samples), "repeat": len(samples)}
+
+
+def run_profiles(repeat: int) -> Dict[str, Any]:
+    """Profile ``repeat`` fresh interpreters of each kind and return the medians with the package breakdown."""
+    results: Results = {}
+    imports = [import_profile() for _ in range(repeat)]
+    results["import.app"] = timing([profile["total"] for profile in imports])
+
+    packages = {
+        package: statistics.median(profile["packages"].get(package, 0) for profile in imports)
+        for package in imports[0]["packages"]
+    }
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+    for package, self_us in heaviest:
+        results[f"import.package.{package}"] = {"kind": "time", "unit": "us", "value": self_us, "repeat": repeat}
+
+    cold = [first_event_profile(warm=False) for _ in range(repeat)]
+    warm = [first_event_profile(warm=True) for _ in range(repeat)]
+    results["first_event.cold"] = timing([probe["first_event"] for probe in cold])
+    results["first_event.warm"] = timing([probe["first_event"] for probe in warm])
+    results["warm_up"] = timing([probe["warm_up"] for probe in warm])
+    results["compile.pages"] = timing([compile_profile()["compile"] for _ in range(repeat)])
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path("startup_output.json"), help="where to write the results")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="also write the results to this baseline file")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--time-tolerance", type=float, default=1.5, help="allowed timing ratio against the baseline")
+    args = parser.parse_args(argv)
+
+    report = run_profiles(args.repeat)
+    regressions = []
+    if args.baseline is not None:
+        from benchmarks.run import compare_to_baseline
+
+        baseline = json.loads(args.baseline.read_text())
+        # Self time moves between packages as imports are reordered; gate on the totals only
+        gated = {name: result for name, result in baseline["results"].items() if not name.startswith("import.package.")}
+        regressions = compare_to_baseline(report, {"results": gated}, args.time_tolerance, args.time_tolerance)
+    report["regressions"] = regressions
+
+    args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(report, indent=2))
+
+    for name, result in report["results"].items():
+        ratio = f"  ({result['ratio']:.2f}x)" if "ratio" in result else ""
+        print(f"{name:<40} {result['value'] / 1000:>10.1f} ms{ratio}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Backend API routes served alongside the Reflex app."""
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from real_estate_reflex.engine.cache import cached_schedule
+from real_estate_reflex.engine.export import gzip_chunks, iter_schedule_csv
+from real_estate_reflex.metrics import METRICS_ROUTE, render_metrics
+
+CSV_DOWNLOAD_ROUTE = "/download/amortization_table.csv"
+
+api = FastAPI()
+
+
+@api.get(CSV_DOWNLOAD_ROUTE)
+def download_amortization_csv(
+    request: Request,
+    principal: float = Query(..., gt=0),
+    rate: float = Query(..., ge=0, le=100),
+    years: int = Query(..., ge=1, le=50),
+) -> StreamingResponse:
+    """Stream the amortization schedule for a loan as CSV, gzipped when the client accepts it."""
+    chunks = iter_schedule_csv(cached_schedule(principal, rate, years))
+    headers = {"Content-Disposition": 'attachment; filename="amortization_schedule.csv"'}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(chunks, media_type="text/csv", headers=headers)
+
+
+@api.get(METRICS_ROUTE)
+def metrics() -> PlainTextResponse:
+    """Expose handler latency, delta size, schedule size and cache metrics as Prometheus text."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,151 @@
+"""Plotly figures for the real estate loan calculator charts."""
+
+import numpy as np
+import plotly.graph_objects as go
+from typing import Dict, List
+
+from real_estate_reflex.engine.charts import OverlaySeries, Series
+from real_estate_reflex.engine.sensitivity import SensitivityGrid
+
+def empty_figure() -> go.Figure:
+    """Placeholder for a chart with nothing to show yet.
+
+    The bare "none" template keeps plotly's ~7 KB default template out of
+    every state delta that carries the placeholder.
+    """
+    return go.Figure(layout=dict(template="none"))
+
+def interest_principal_figure(principal: float, total_interest: float) -> go.Figure:
+    """Donut chart figure of the total principal against the total interest."""
+    return go.Figure(
+        data=[
+            go.Pie(
+                labels=["Principal", "Interest"],
+                values=[principal, total_interest],
+                hole=0.4,
+                marker=dict(colors=["#3182CE", "#E53E3E"]),
+            )
+        ],
+        layout=dict(
+            height=300,
+            margin=dict(l=20, r=20, t=30, b=20),
+        ),
+    )
+
+def principal_interest_figure(series: Dict[str, Series]) -> go.Figure:
+    """Line chart figure of principal vs interest payments over time."""
+    principal_x, principal_y = series["principal"]
+    interest_x, interest_y = series["interest"]
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=principal_x,
+                y=principal_y,
+                mode="lines",
+                name="Principal",
+                line=dict(color="#3182CE", width=2),
+            ),
+            go.Scatter(
+                x=interest_x,
+                y=interest_y,
+                mode="lines",
+                name="Interest",
+                line=dict(color="#E53E3E", width=2),
+            ),
+        ],
+        layout=dict(
+            height=400,
+            margin=dict(l=50, r=20, t=30, b=50),
+            xaxis_title="Month",
+            yaxis_title="Amount ($)",
+        ),
+    )
+
+def balance_figure(series: Dict[str, Series]) -> go.Figure:
+    """Line chart figure of the remaining balance over time."""
+    balance_x, balance_y = series["balance"]
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=balance_x,
+                y=balance_y,
+                mode="lines",
+                name="Remaining Balance",
+                line=dict(color="#805AD5", width=2),
+                fill="tozeroy",
+            ),
+        ],
+        layout=dict(
+            height=400,
+            margin=dict(l=50, r=20, t=30, b=50),
+            xaxis_title="Month",
+            yaxis_title="Remaining Balance ($)",
+        ),
+    )
+
+def scenario_overlay_figure(names: List[str], overlay: OverlaySeries, yaxis_title: str) -> go.Figure:
+    """Line chart figure overlaying one curve per scenario on a shared month axis."""
+    months, curves = overlay
+    return go.Figure(
+        data=[
+            go.Scatter(x=months, y=curve, mode="lines", name=name, line=dict(width=2))
+            for name, curve in zip(names, curves)
+        ],
+        layout=dict(
+            height=400,
+            margin=dict(l=50, r=20, t=30, b=50),
+            xaxis_title="Month",
+            yaxis_title=yaxis_title,
+            hovermode="x unified",
+        ),
+    )
+
+def sensitivity_heatmap_figure(grid: SensitivityGrid, metric: str) -> go.Figure:
+    """Heatmap figure of a rate x term sensitivity grid for one metric."""
+    title = "Monthly Payment ($)" if metric == "monthly_payment" else "Total Interest ($)"
+    return go.Figure(
+        data=[
+            go.Heatmap(
+                x=grid.terms.tolist(),
+                y=grid.rates.tolist(),
+                z=np.round(getattr(grid, metric), 2).tolist(),
+                colorscale="Viridis",
+                colorbar=dict(title=title),
+                hovertemplate="Term: %{x} years<br>Rate: %{y}%<br>" + title + ": %{z:,.2f}<extra></extra>",
+            ),
+        ],
+        layout=dict(
+            height=500,
+            margin=dict(l=50, r=20, t=30, b=50),
+            xaxis_title="Term (Years)",
+            yaxis_title="Interest Rate (%)",
+        ),
+    )
+
+AFFORDABILITY_AXIS_TITLES = {
+    "max_principal": "Maximum Loan Amount ($)",
+    "max_rate": "Maximum Interest Rate (%)",
+    "min_term": "Minimum Term (Years)",
+}
+
+def affordability_figure(budgets: np.ndarray, values: np.ndarray, query: str) -> go.Figure:
+    """Line chart figure of an inverse loan query across monthly payment budgets."""
+    # Unreachable targets (NaN or inf) become gaps in the line
+    reachable = np.isfinite(values)
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=np.round(budgets, 2).tolist(),
+                y=[round(float(value), 4) if ok else None for value, ok in zip(values, reachable)],
+                mode="lines",
+                name=AFFORDABILITY_AXIS_TITLES[query],
+                line=dict(color="#38A169", width=2),
+            ),
+        ],
+        layout=dict(
+            height=400,
+            margin=dict(l=50, r=20, t=30, b=50),
+            xaxis_title="Monthly Payment Budget ($)",
+            yaxis_title=AFFORDABILITY_AXIS_TITLES[query],
+        ),
+    )
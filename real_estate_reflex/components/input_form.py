@@ -1,52 +1,77 @@
 """Input form component for the real estate loan calculator."""
 
+from typing import Optional, Type
+
 import reflex as rx
-from real_estate_reflex.real_estate_reflex import State
+from real_estate_reflex.real_estate_reflex import (
+    AffordabilityState,
+    ArmState,
+    ComparisonState,
+    PrepaymentState,
+    SimulationState,
+    State,
+)
+
+def field_label(label: str) -> rx.Component:
+    """Label above a form input."""
+    return rx.text(label, as_="label", size="2", weight="medium")
+
+def number_field(label: str, value: rx.Var, on_change, step: float, min_: float = 0, max_: Optional[float] = None) -> rx.Component:
+    """Labelled number input; the browser sends its value as a string, which the state handlers parse."""
+    return rx.vstack(
+        field_label(label),
+        rx.input(
+            type="number",
+            value=value,
+            on_change=on_change,
+            min=min_,
+            max=max_,
+            step=step,
+            width="100%",
+        ),
+        spacing="1",
+        width="100%",
+    )
+
+def state_number_field(label: str, state: Type[rx.State], field: str, step: float) -> rx.Component:
+    """Number field for a var of a state that sets its number inputs through ``update_input(field, value)``."""
+    return number_field(label, getattr(state, field), lambda value: state.update_input(field, value), step)
 
 def input_form() -> rx.Component:
     """Input form for loan parameters."""
     return rx.card(
         rx.vstack(
-            rx.heading("Loan Parameters", size="lg", mb="4"),
-            rx.form_control(
-                rx.form_label("Loan Amount ($)"),
-                rx.number_input(
-                    value=State.loan_amount,
-                    on_change=State.set_loan_amount,
-                    min_=1,
-                    step=1000,
-                    width="100%",
-                ),
+            rx.heading("Loan Parameters", size="5"),
+            number_field("Loan Amount ($)", State.loan_amount, State.update_loan_amount.debounce(300), 1000, min_=1),
+            number_field(
+                "Annual Interest Rate (%)",
+                State.annual_interest_rate,
+                State.update_annual_interest_rate.debounce(300),
+                0.1,
+                max_=30,
             ),
-            rx.form_control(
-                rx.form_label("Annual Interest Rate (%)"),
-                rx.number_input(
-                    value=State.annual_interest_rate,
-                    on_change=State.set_annual_interest_rate,
-                    min_=0,
-                    max_=30,
-                    step=0.1,
-                    precision=2,
-                    width="100%",
-                ),
+            number_field(
+                "Loan Term (Years)",
+                State.loan_term_years,
+                State.update_loan_term_years.debounce(300),
+                1,
+                min_=1,
+                max_=50,
             ),
-            rx.form_control(
-                rx.form_label("Loan Term (Years)"),
-                rx.number_input(
-                    value=State.loan_term_years,
-                    on_change=State.set_loan_term_years,
-                    min_=1,
-                    max_=50,
-                    step=1,
-                    width="100%",
+            rx.hstack(
+                rx.switch(
+                    checked=State.live_update,
+                    on_change=State.set_live_update,
                 ),
+                rx.text("Update results as I type"),
+                spacing="2",
             ),
             rx.button(
                 "Calculate",
                 on_click=State.calculate_loan,
                 color_scheme="blue",
                 width="100%",
-                mt="4",
+                margin_top="1rem",
             ),
             spacing="4",
             width="100%",
@@ -58,164 +83,316 @@ def affordability_estimator() -> rx.Component:
     """Affordability estimator form."""
     return rx.card(
         rx.vstack(
-            rx.heading("Affordability Estimator", size="lg", mb="4"),
+            rx.heading("Affordability Estimator", size="5"),
             rx.text(
                 "Enter your desired monthly payment to estimate how much you can afford to borrow."
             ),
-            rx.form_control(
-                rx.form_label("Desired Monthly Payment ($)"),
-                rx.number_input(
-                    value=State.desired_monthly_payment,
-                    on_change=State.set_desired_monthly_payment,
-                    min_=1,
-                    step=100,
-                    width="100%",
-                ),
+            number_field("Desired Monthly Payment ($)", State.desired_monthly_payment, State.update_desired_monthly_payment, 100, min_=1),
+            rx.cond(
+                State.affordable_loan_amount > 0,
+                rx.text(f"Estimated Affordable Loan Amount: ${State.affordable_loan_amount:,.2f}", font_weight="bold"),
+                rx.text(""),
+            ),
+            rx.cond(
+                AffordabilityState.affordable_max_rate > 0,
+                rx.text(f"Highest Rate for the Current Loan: {AffordabilityState.affordable_max_rate}%"),
+                rx.text(""),
+            ),
+            rx.cond(
+                AffordabilityState.affordable_min_term_months > 0,
+                rx.text(f"Shortest Term at the Current Rate: {AffordabilityState.affordable_min_term_months} months"),
+                rx.text(""),
             ),
-            rx.text(
-                f"Estimated Affordable Loan Amount: ${State.affordable_loan_amount:,.2f}",
-                font_weight="bold",
-                mt="2",
-            ) if State.affordable_loan_amount > 0 else rx.text(""),
             rx.button(
                 "Calculate Affordable Amount",
-                on_click=State.calculate_affordable_loan,
+                on_click=AffordabilityState.solve_affordability,
                 color_scheme="green",
                 width="100%",
-                mt="4",
+                margin_top="1rem",
             ),
+            rx.hstack(
+                rx.heading("Affordability Curve", size="4"),
+                rx.spacer(),
+                rx.select(
+                    ["max_principal", "max_rate", "min_term"],
+                    value=AffordabilityState.affordability_query,
+                    on_change=AffordabilityState.set_affordability_query,
+                    size="1",
+                ),
+                width="100%",
+                margin_top="1rem",
+            ),
+            rx.plotly(data=AffordabilityState.affordability_chart, on_mount=AffordabilityState.show_affordability),
             spacing="4",
             width="100%",
         ),
         width="100%",
-        mt="6",
+        margin_top="1.5rem",
     )
 
-def scenario_comparison() -> rx.Component:
-    """Scenario comparison component."""
+def prepayment_form() -> rx.Component:
+    """Extra payment form showing how much earlier the loan is paid off."""
     return rx.card(
         rx.vstack(
-            rx.heading("Loan Scenario Comparison", size="lg", mb="4"),
-            rx.box(
-                rx.hstack(
-                    rx.vstack(
-                        rx.heading("Scenario A", size="md"),
-                        rx.form_control(
-                            rx.form_label("Loan Amount ($)"),
-                            rx.number_input(
-                                value=State.scenario_a_loan_amount,
-                                on_change=State.set_scenario_a_loan_amount,
-                                min_=1,
-                                step=1000,
-                                width="100%",
-                            ),
-                        ),
-                        rx.form_control(
-                            rx.form_label("Interest Rate (%)"),
-                            rx.number_input(
-                                value=State.scenario_a_interest_rate,
-                                on_change=State.set_scenario_a_interest_rate,
-                                min_=0,
-                                max_=30,
-                                step=0.1,
-                                precision=2,
-                                width="100%",
-                            ),
-                        ),
-                        rx.form_control(
-                            rx.form_label("Term (Years)"),
-                            rx.number_input(
-                                value=State.scenario_a_term_years,
-                                on_change=State.set_scenario_a_term_years,
-                                min_=1,
-                                max_=50,
-                                step=1,
-                                width="100%",
-                            ),
-                        ),
-                        width="48%",
-                    ),
-                    rx.vstack(
-                        rx.heading("Scenario B", size="md"),
-                        rx.form_control(
-                            rx.form_label("Loan Amount ($)"),
-                            rx.number_input(
-                                value=State.scenario_b_loan_amount,
-                                on_change=State.set_scenario_b_loan_amount,
-                                min_=1,
-                                step=1000,
-                                width="100%",
-                            ),
-                        ),
-                        rx.form_control(
-                            rx.form_label("Interest Rate (%)"),
-                            rx.number_input(
-                                value=State.scenario_b_interest_rate,
-                                on_change=State.set_scenario_b_interest_rate,
-                                min_=0,
-                                max_=30,
-                                step=0.1,
-                                precision=2,
-                                width="100%",
-                            ),
-                        ),
-                        rx.form_control(
-                            rx.form_label("Term (Years)"),
-                            rx.number_input(
-                                value=State.scenario_b_term_years,
-                                on_change=State.set_scenario_b_term_years,
-                                min_=1,
-                                max_=50,
-                                step=1,
-                                width="100%",
-                            ),
-                        ),
-                        width="48%",
+            rx.heading("Extra Payments", size="5"),
+            state_number_field("Extra Monthly Payment ($)", PrepaymentState, "extra_monthly_payment", 50),
+            state_number_field("Extra Yearly Payment ($)", PrepaymentState, "extra_yearly_payment", 1000),
+            rx.vstack(
+                field_label("Lump Sums (month:amount)"),
+                rx.input(
+                    placeholder="e.g. 60:10000, 120:5000",
+                    value=PrepaymentState.lump_sums,
+                    on_change=PrepaymentState.set_lump_sums,
+                    width="100%",
+                ),
+                spacing="1",
+                width="100%",
+            ),
+            rx.cond(
+                PrepaymentState.prepayment_error != "",
+                rx.text(PrepaymentState.prepayment_error, color_scheme="red"),
+                rx.text(""),
+            ),
+            rx.cond(
+                PrepaymentState.prepayment_payoff_month > 0,
+                rx.vstack(
+                    rx.text(f"Paid Off In: {PrepaymentState.prepayment_payoff_month} months ({PrepaymentState.prepayment_months_saved} months early)"),
+                    rx.text(f"Total Interest: ${PrepaymentState.prepayment_total_interest:,.2f}"),
+                    rx.text(f"Interest Saved: ${PrepaymentState.prepayment_interest_saved:,.2f}", font_weight="bold"),
+                    align_items="flex-start",
+                    width="100%",
+                ),
+                rx.text(""),
+            ),
+            rx.button(
+                "Calculate Savings",
+                on_click=PrepaymentState.calculate_prepayments,
+                color_scheme="teal",
+                width="100%",
+                margin_top="1rem",
+            ),
+            spacing="4",
+            width="100%",
+        ),
+        width="100%",
+        margin_top="1.5rem",
+    )
+
+def arm_form() -> rx.Component:
+    """Adjustable-rate form showing the payment after every rate reset."""
+    return rx.card(
+        rx.vstack(
+            rx.heading("Adjustable-Rate Mortgage", size="5"),
+            rx.text("Uses the loan amount and term from the calculator; the index is assumed to change by a constant amount each year."),
+            rx.hstack(
+                state_number_field("Initial Rate (%)", ArmState, "arm_initial_rate", 0.125),
+                state_number_field("Fixed Period (Years)", ArmState, "arm_fixed_years", 1),
+                state_number_field("Margin (%)", ArmState, "arm_margin", 0.125),
+                width="100%",
+            ),
+            rx.hstack(
+                state_number_field("First Reset Cap (%)", ArmState, "arm_initial_cap", 0.5),
+                state_number_field("Periodic Cap (%)", ArmState, "arm_periodic_cap", 0.5),
+                state_number_field("Lifetime Cap (%)", ArmState, "arm_lifetime_cap", 0.5),
+                width="100%",
+            ),
+            rx.hstack(
+                state_number_field("Index Today (%)", ArmState, "arm_index_rate", 0.25),
+                state_number_field("Index Change per Year (%)", ArmState, "arm_index_change", 0.05),
+                width="100%",
+            ),
+            rx.button(
+                "Calculate ARM",
+                on_click=ArmState.calculate_arm,
+                color_scheme="orange",
+                width="100%",
+                margin_top="1rem",
+            ),
+            rx.cond(
+                ArmState.arm_initial_payment > 0,
+                rx.vstack(
+                    rx.text(f"Initial Payment: ${ArmState.arm_initial_payment:,.2f}"),
+                    rx.text(f"Highest Payment: ${ArmState.arm_max_payment:,.2f}"),
+                    rx.text(f"Total Interest: ${ArmState.arm_total_interest:,.2f}", font_weight="bold"),
+                    rx.foreach(
+                        ArmState.arm_resets,
+                        lambda reset: rx.text(f"Month {reset['month']}: {reset['rate']}% (${reset['payment'].to(float):,.2f})", size="2"),
                     ),
+                    align_items="flex-start",
                     width="100%",
-                    justify="space-between",
                 ),
+                rx.text(""),
+            ),
+            spacing="4",
+            width="100%",
+        ),
+        width="100%",
+        margin_top="1.5rem",
+    )
+
+def simulation_form() -> rx.Component:
+    """Monte Carlo form showing percentiles of interest, payment shock and payoff month."""
+    return rx.card(
+        rx.vstack(
+            rx.heading("Rate and Prepayment Simulation", size="5"),
+            rx.text("Simulates the current loan under random index paths, with refinancing more likely when rates fall."),
+            rx.hstack(
+                state_number_field("Paths", SimulationState, "sim_paths", 1000),
+                state_number_field("Seed", SimulationState, "sim_seed", 1),
+                state_number_field("Fixed Period (Years)", SimulationState, "sim_fixed_years", 1),
+                width="100%",
+            ),
+            rx.hstack(
+                state_number_field("Index Today (%)", SimulationState, "sim_index_rate", 0.25),
+                state_number_field("Index Volatility (%/year)", SimulationState, "sim_volatility", 0.25),
                 width="100%",
             ),
             rx.button(
-                "Compare Scenarios",
-                on_click=State.compare_scenarios,
+                "Run Simulation",
+                on_click=SimulationState.run_simulation,
+                disabled=SimulationState.sim_running,
                 color_scheme="purple",
                 width="100%",
-                mt="4",
+                margin_top="1rem",
+            ),
+            rx.cond(
+                SimulationState.sim_running,
+                rx.progress(value=SimulationState.sim_progress, width="100%"),
+                rx.text(""),
+            ),
+            rx.cond(
+                SimulationState.sim_error != "",
+                rx.text(SimulationState.sim_error, color_scheme="red"),
+                rx.text(""),
             ),
             rx.cond(
-                State.scenario_a_monthly > 0,
+                SimulationState.sim_percentiles.length() > 0,
                 rx.vstack(
-                    rx.heading("Comparison Results", size="md", mt="4"),
                     rx.hstack(
-                        rx.vstack(
-                            rx.text("Monthly Payment:"),
-                            rx.text("Total Interest:"),
-                            rx.text("Total Payment:"),
-                            rx.text("Total Years:"),
-                            align_items="flex-start",
-                            width="30%",
-                        ),
-                        rx.vstack(
-                            rx.text(f"${State.scenario_a_monthly:,.2f}"),
-                            rx.text(f"${State.scenario_a_total_interest:,.2f}"),
-                            rx.text(f"${State.scenario_a_monthly * State.scenario_a_term_years * 12:,.2f}"),
-                            rx.text(f"{State.scenario_a_term_years} years"),
-                            align_items="flex-end",
-                            width="30%",
+                        rx.text("Percentile", font_weight="bold", width="25%"),
+                        rx.text("Total Interest", font_weight="bold", width="25%"),
+                        rx.text("Payment Shock", font_weight="bold", width="25%"),
+                        rx.text("Payoff Month", font_weight="bold", width="25%"),
+                        width="100%",
+                    ),
+                    rx.foreach(
+                        SimulationState.sim_percentiles,
+                        lambda row: rx.hstack(
+                            rx.text(f"P{row['percentile']}", width="25%"),
+                            rx.text(f"${row['total_interest'].to(float):,.2f}", width="25%"),
+                            rx.text(f"{row['payment_shock']}x", width="25%"),
+                            rx.text(row["payoff_month"], width="25%"),
+                            width="100%",
                         ),
-                        rx.vstack(
-                            rx.text(f"${State.scenario_b_monthly:,.2f}"),
-                            rx.text(f"${State.scenario_b_total_interest:,.2f}"),
-                            rx.text(f"${State.scenario_b_monthly * State.scenario_b_term_years * 12:,.2f}"),
-                            rx.text(f"{State.scenario_b_term_years} years"),
-                            align_items="flex-end",
-                            width="30%",
+                    ),
+                    width="100%",
+                ),
+                rx.text(""),
+            ),
+            spacing="4",
+            width="100%",
+        ),
+        width="100%",
+        margin_top="1.5rem",
+    )
+
+def scenario_inputs(scenario: rx.Var, index: int) -> rx.Component:
+    """Inputs for one comparison scenario."""
+    return rx.hstack(
+        rx.text(scenario["name"], font_weight="bold", width="15%"),
+        number_field(
+            "Loan Amount ($)",
+            scenario["loan_amount"],
+            lambda value: ComparisonState.update_scenario(index, "loan_amount", value),
+            1000,
+            min_=1,
+        ),
+        number_field(
+            "Interest Rate (%)",
+            scenario["interest_rate"],
+            lambda value: ComparisonState.update_scenario(index, "interest_rate", value),
+            0.1,
+            max_=30,
+        ),
+        number_field(
+            "Term (Years)",
+            scenario["term_years"],
+            lambda value: ComparisonState.update_scenario(index, "term_years", value),
+            1,
+            min_=1,
+            max_=50,
+        ),
+        rx.button("Remove", on_click=ComparisonState.remove_scenario(index), size="1", color_scheme="red"),
+        width="100%",
+        align_items="flex-end",
+    )
+
+def scenario_result_row(result: rx.Var) -> rx.Component:
+    """One ranked row of the comparison table."""
+    return rx.hstack(
+        rx.text(result["rank"], width="10%"),
+        rx.text(result["name"], width="20%"),
+        rx.text(f"${result['monthly_payment'].to(float):,.2f}", width="20%"),
+        rx.text(f"${result['total_interest'].to(float):,.2f}", width="20%"),
+        rx.text(f"${result['total_payment'].to(float):,.2f}", width="20%"),
+        rx.text(f"{result['term_years']} years", width="10%"),
+        width="100%",
+    )
+
+def scenario_comparison() -> rx.Component:
+    """Scenario comparison component."""
+    return rx.card(
+        rx.vstack(
+            rx.heading("Loan Scenario Comparison", size="5"),
+            rx.vstack(
+                rx.foreach(ComparisonState.scenarios, scenario_inputs),
+                width="100%",
+            ),
+            rx.hstack(
+                rx.button(
+                    "Add Scenario",
+                    on_click=ComparisonState.add_scenario,
+                    width="50%",
+                ),
+                rx.button(
+                    "Compare Scenarios",
+                    on_click=ComparisonState.compare_scenarios,
+                    color_scheme="purple",
+                    width="50%",
+                ),
+                width="100%",
+                margin_top="1rem",
+            ),
+            rx.cond(
+                ComparisonState.scenario_results.length() > 0,
+                rx.vstack(
+                    rx.hstack(
+                        rx.heading("Comparison Results", size="4"),
+                        rx.spacer(),
+                        rx.text("Rank by:"),
+                        rx.select(
+                            ["total_interest", "total_payment", "monthly_payment"],
+                            value=ComparisonState.scenario_rank_by,
+                            on_change=ComparisonState.rank_scenarios,
+                            size="1",
                         ),
                         width="100%",
-                        justify="space-between",
+                        margin_top="1rem",
+                    ),
+                    rx.hstack(
+                        rx.text("Rank", font_weight="bold", width="10%"),
+                        rx.text("Scenario", font_weight="bold", width="20%"),
+                        rx.text("Monthly Payment", font_weight="bold", width="20%"),
+                        rx.text("Total Interest", font_weight="bold", width="20%"),
+                        rx.text("Total Payment", font_weight="bold", width="20%"),
+                        rx.text("Term", font_weight="bold", width="10%"),
+                        width="100%",
                     ),
+                    rx.foreach(ComparisonState.scenario_results, scenario_result_row),
+                    rx.heading("Remaining Balance", size="4", margin_top="1rem"),
+                    rx.plotly(data=ComparisonState.scenario_balance_chart),
+                    rx.heading("Monthly Interest", size="4", margin_top="1rem"),
+                    rx.plotly(data=ComparisonState.scenario_interest_chart),
                     width="100%",
                 ),
                 rx.text(""),
@@ -224,5 +401,5 @@ def scenario_comparison() -> rx.Component:
             width="100%",
         ),
         width="100%",
-        mt="6",
+        margin_top="1.5rem",
     )
@@ -0,0 +1,54 @@
+"""Page layout shared by every page of the real estate loan calculator."""
+
+import datetime
+
+import reflex as rx
+
+# Fixed when the app is compiled, so the footer exports as static markup
+COPYRIGHT_YEAR = datetime.date.today().year
+
+
+@rx.memo
+def page_header(title: rx.Var[str], subtitle: rx.Var[str]) -> rx.Component:
+    """Page title and subtitle, compiled once and shared by every page."""
+    return rx.box(
+        rx.vstack(
+            rx.heading(title, size="8"),
+            rx.text(subtitle, color_scheme="gray", size="4"),
+            align_items="center",
+            spacing="2",
+            padding_y="1.5rem",
+        ),
+        width="100%",
+        text_align="center",
+    )
+
+
+@rx.memo
+def page_footer() -> rx.Component:
+    """Static footer, compiled once and shared by every page."""
+    return rx.box(
+        rx.text(
+            f"© {COPYRIGHT_YEAR} Real Estate Loan Calculator. Built with Reflex.",
+            color_scheme="gray",
+            text_align="center",
+        ),
+        padding_y="1rem",
+        margin_top="2.5rem",
+        width="100%",
+    )
+
+
+def page_layout(title: str, subtitle: str, *content: rx.Component) -> rx.Component:
+    """A page: the shared header and footer around the page's own (state-bound) content."""
+    return rx.container(
+        rx.vstack(
+            page_header(title=title, subtitle=subtitle),
+            *content,
+            page_footer(),
+            width="100%",
+            max_width="1200px",
+            padding_x="1rem",
+        ),
+        padding_y="1rem",
+    )
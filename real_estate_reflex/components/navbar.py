@@ -38,6 +38,13 @@ def navbar() -> rx.Component:
                     border_radius="md",
                     _hover={"bg": "gray.100"},
                 ),
+                rx.link(
+                    "Portfolio",
+                    href="/portfolio",
+                    padding="2",
+                    border_radius="md",
+                    _hover={"bg": "gray.100"},
+                ),
                 rx.color_mode.button(),
                 spacing="4",
             ),
@@ -0,0 +1,109 @@
+"""Portfolio import component for the real estate loan calculator."""
+
+import reflex as rx
+from real_estate_reflex.components.results import format_currency
+from real_estate_reflex.real_estate_reflex import PortfolioState
+
+def portfolio_upload() -> rx.Component:
+    """Upload form and results for amortizing a whole loan book."""
+    return rx.card(
+        rx.vstack(
+            rx.heading("Portfolio Import", size="5"),
+            rx.text(
+                "Upload a CSV or Parquet file with principal, annual_rate and years columns "
+                "(an optional loan_id column is carried through to the per-loan summary)."
+            ),
+            rx.upload(
+                rx.vstack(
+                    rx.button("Select Loan File", size="1"),
+                    rx.text(rx.selected_files("portfolio_upload")),
+                ),
+                id="portfolio_upload",
+                accept={"text/csv": [".csv"], "application/octet-stream": [".parquet", ".pq"]},
+                max_files=1,
+                border="1px dashed",
+                padding="1rem",
+                width="100%",
+            ),
+            rx.button(
+                "Amortize Portfolio",
+                on_click=PortfolioState.handle_portfolio_upload(rx.upload_files(upload_id="portfolio_upload")),
+                disabled=PortfolioState.job_running,
+                color_scheme="blue",
+                width="100%",
+            ),
+            rx.cond(
+                PortfolioState.job_running,
+                rx.vstack(
+                    rx.progress(value=PortfolioState.job_progress, width="100%"),
+                    rx.hstack(
+                        rx.text(f"{PortfolioState.job_status}: {PortfolioState.job_progress}%"),
+                        rx.spacer(),
+                        rx.button("Cancel", on_click=PortfolioState.cancel_job, size="1", color_scheme="red"),
+                        width="100%",
+                    ),
+                    width="100%",
+                ),
+                rx.text(PortfolioState.job_status, color_scheme="gray"),
+            ),
+            rx.cond(
+                PortfolioState.portfolio_error != "",
+                rx.text(PortfolioState.portfolio_error, color_scheme="red"),
+                rx.text(""),
+            ),
+            rx.cond(
+                PortfolioState.portfolio_loan_count > 0,
+                rx.vstack(
+                    rx.hstack(
+                        rx.text("Loans:", font_weight="bold"),
+                        rx.spacer(),
+                        rx.text(f"{PortfolioState.portfolio_loan_count} ({PortfolioState.portfolio_skipped_rows} invalid rows skipped)"),
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.text("Total Principal:", font_weight="bold"),
+                        rx.spacer(),
+                        rx.text(format_currency(PortfolioState.portfolio_total_principal)),
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.text("Total Interest:", font_weight="bold"),
+                        rx.spacer(),
+                        rx.text(format_currency(PortfolioState.portfolio_total_interest)),
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.text("Total Payment:", font_weight="bold"),
+                        rx.spacer(),
+                        rx.text(format_currency(PortfolioState.portfolio_total_payment)),
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.text("Runoff Horizon:", font_weight="bold"),
+                        rx.spacer(),
+                        rx.text(f"{PortfolioState.portfolio_months} months"),
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.button(
+                            "Download Per-Loan Summary",
+                            on_click=rx.download(url=rx.get_upload_url(PortfolioState.portfolio_summary_file)),
+                            size="1",
+                        ),
+                        rx.button(
+                            "Download Monthly Runoff",
+                            on_click=rx.download(url=rx.get_upload_url(PortfolioState.portfolio_runoff_file)),
+                            size="1",
+                        ),
+                        spacing="4",
+                    ),
+                    spacing="2",
+                    width="100%",
+                ),
+                rx.text(""),
+            ),
+            spacing="4",
+            width="100%",
+        ),
+        width="100%",
+    )
@@ -1,9 +1,10 @@
 """Results component for the real estate loan calculator."""
 
 import reflex as rx
-import plotly.express as px
-import plotly.graph_objects as go
-from real_estate_reflex.real_estate_reflex import State
+from real_estate_reflex.engine.amortization import SCHEDULE_COLUMNS
+from real_estate_reflex.real_estate_reflex import ComparisonState, ScheduleState, State
+
+SCHEDULE_HEADERS = ("Month", "Starting Balance", "Payment", "Principal", "Interest", "Ending Balance")
 
 def format_currency(value: float) -> str:
     """Format a value as currency."""
@@ -13,7 +14,7 @@ def summary_card() -> rx.Component:
     """Summary card showing loan calculation results."""
     return rx.card(
         rx.vstack(
-            rx.heading("Loan Summary", size="lg", mb="4"),
+            rx.heading("Loan Summary", size="5"),
             rx.cond(
                 State.monthly_payment > 0,
                 rx.vstack(
@@ -62,25 +63,10 @@ def interest_principal_pie_chart() -> rx.Component:
     """Pie chart showing interest to principal ratio."""
     return rx.card(
         rx.vstack(
-            rx.heading("Interest to Principal Ratio", size="md", mb="4"),
+            rx.heading("Interest to Principal Ratio", size="4"),
             rx.cond(
                 State.total_interest > 0,
-                rx.plotly(
-                    go.Figure(
-                        data=[
-                            go.Pie(
-                                labels=["Principal", "Interest"],
-                                values=[State.loan_amount, State.total_interest],
-                                hole=0.4,
-                                marker=dict(colors=["#3182CE", "#E53E3E"]),
-                            )
-                        ],
-                        layout=dict(
-                            height=300,
-                            margin=dict(l=20, r=20, t=30, b=20),
-                        ),
-                    ),
-                ),
+                rx.plotly(data=ScheduleState.interest_principal_chart, on_mount=ScheduleState.show_charts),
                 rx.text("No data to display yet."),
             ),
             width="100%",
@@ -92,49 +78,18 @@ def principal_interest_line_chart() -> rx.Component:
     """Line chart showing principal vs interest payments over time."""
     return rx.card(
         rx.vstack(
-            rx.heading("Principal vs Interest Over Time", size="md", mb="4"),
+            rx.heading("Principal vs Interest Over Time", size="4"),
             rx.cond(
-                len(State.amortization_table) > 0,
-                rx.cond(
-                    # Only show for loans with reasonable terms (avoid performance issues)
-                    State.loan_term_years <= 30,
-                    rx.vstack(
-                        rx.plotly(
-                            lambda: go.Figure(
-                                data=[
-                                    go.Scatter(
-                                        x=[item["month"] for item in State.amortization_table],
-                                        y=[item["principal"] for item in State.amortization_table],
-                                        mode="lines",
-                                        name="Principal",
-                                        line=dict(color="#3182CE", width=2),
-                                    ),
-                                    go.Scatter(
-                                        x=[item["month"] for item in State.amortization_table],
-                                        y=[item["interest"] for item in State.amortization_table],
-                                        mode="lines",
-                                        name="Interest",
-                                        line=dict(color="#E53E3E", width=2),
-                                    ),
-                                ],
-                                layout=dict(
-                                    height=400,
-                                    margin=dict(l=50, r=20, t=30, b=50),
-                                    xaxis_title="Month",
-                                    yaxis_title="Amount ($)",
-                                ),
-                            )
-                        ),
-                        rx.text(
-                            "This chart shows how your monthly payment is split between principal and interest over time. "
-                            "As the loan progresses, more of your payment goes toward principal and less toward interest.",
-                            font_size="sm",
-                            color="gray.600",
-                            mt="2",
-                        ),
-                        width="100%",
+                State.schedule_months > 0,
+                rx.vstack(
+                    rx.plotly(data=ScheduleState.principal_interest_chart, on_mount=ScheduleState.show_charts),
+                    rx.text(
+                        "This chart shows how your monthly payment is split between principal and interest over time. "
+                        "As the loan progresses, more of your payment goes toward principal and less toward interest.",
+                        size="2",
+                        color_scheme="gray",
                     ),
-                    rx.text("Chart not displayed for loan terms over 30 years to improve performance."),
+                    width="100%",
                 ),
                 rx.text("No data to display yet."),
             ),
@@ -147,42 +102,17 @@ def remaining_balance_chart() -> rx.Component:
     """Line chart showing remaining balance over time."""
     return rx.card(
         rx.vstack(
-            rx.heading("Remaining Balance Over Time", size="md", mb="4"),
+            rx.heading("Remaining Balance Over Time", size="4"),
             rx.cond(
-                len(State.amortization_table) > 0,
-                rx.cond(
-                    # Only show for loans with reasonable terms (avoid performance issues)
-                    State.loan_term_years <= 30,
-                    rx.vstack(
-                        rx.plotly(
-                            lambda: go.Figure(
-                                data=[
-                                    go.Scatter(
-                                        x=[item["month"] for item in State.amortization_table],
-                                        y=[item["ending_balance"] for item in State.amortization_table],
-                                        mode="lines",
-                                        name="Remaining Balance",
-                                        line=dict(color="#805AD5", width=2),
-                                        fill="tozeroy",
-                                    ),
-                                ],
-                                layout=dict(
-                                    height=400,
-                                    margin=dict(l=50, r=20, t=30, b=50),
-                                    xaxis_title="Month",
-                                    yaxis_title="Remaining Balance ($)",
-                                ),
-                            )
-                        ),
-                        rx.text(
-                            "This chart shows how your loan balance decreases over the term of the loan.",
-                            font_size="sm",
-                            color="gray.600",
-                            mt="2",
-                        ),
-                        width="100%",
+                State.schedule_months > 0,
+                rx.vstack(
+                    rx.plotly(data=ScheduleState.balance_chart, on_mount=ScheduleState.show_charts),
+                    rx.text(
+                        "This chart shows how your loan balance decreases over the term of the loan.",
+                        size="2",
+                        color_scheme="gray",
                     ),
-                    rx.text("Chart not displayed for loan terms over 30 years to improve performance."),
+                    width="100%",
                 ),
                 rx.text("No data to display yet."),
             ),
@@ -191,48 +121,107 @@ def remaining_balance_chart() -> rx.Component:
         width="100%",
     )
 
+def sensitivity_heatmap() -> rx.Component:
+    """Heatmap of monthly payment or total interest over interest rates and terms."""
+    return rx.card(
+        rx.vstack(
+            rx.hstack(
+                rx.heading("Rate and Term Sensitivity", size="4"),
+                rx.spacer(),
+                rx.select(
+                    ["monthly_payment", "total_interest"],
+                    value=ComparisonState.sensitivity_metric,
+                    on_change=ComparisonState.set_sensitivity_metric,
+                    size="1",
+                ),
+                width="100%",
+            ),
+            rx.plotly(data=ComparisonState.sensitivity_heatmap, on_mount=ComparisonState.show_sensitivity),
+            rx.text(
+                f"Every combination of interest rate (0.1% to 20%) and term (1 to 50 years) for a loan of "
+                f"{format_currency(State.loan_amount)}.",
+                size="2",
+                color_scheme="gray",
+            ),
+            width="100%",
+        ),
+        width="100%",
+        margin_top="1.5rem",
+    )
+
+def schedule_row(row: rx.Var) -> rx.Component:
+    """One month of the visible amortization table page."""
+    return rx.table.row(
+        rx.table.cell(row["month"]),
+        *[rx.table.cell(format_currency(row[column].to(float))) for column in SCHEDULE_COLUMNS[1:]],
+    )
+
 def amortization_table_component() -> rx.Component:
     """Amortization table showing monthly payment breakdown."""
     return rx.card(
         rx.vstack(
             rx.hstack(
-                rx.heading("Amortization Schedule", size="lg"),
+                rx.heading("Amortization Schedule", size="5"),
                 rx.spacer(),
                 rx.cond(
-                    len(State.amortization_table) > 0,
+                    State.schedule_months > 0,
                     rx.button(
                         "Download CSV",
-                        on_click=rx.download(
-                            url=f"/download/amortization_table.csv",
-                            filename="amortization_table.csv",
-                        ),
-                        size="sm",
+                        on_click=State.download_csv,
+                        size="1",
                     ),
                     rx.text(""),
                 ),
                 width="100%",
             ),
             rx.cond(
-                len(State.amortization_table) > 0,
-                rx.data_table(
-                    data=State.amortization_table,
-                    columns=[
-                        {"header": "Month", "accessor": "month"},
-                        {"header": "Starting Balance", "accessor": "starting_balance", "cell": lambda row: format_currency(row["starting_balance"])},
-                        {"header": "Payment", "accessor": "payment", "cell": lambda row: format_currency(row["payment"])},
-                        {"header": "Principal", "accessor": "principal", "cell": lambda row: format_currency(row["principal"])},
-                        {"header": "Interest", "accessor": "interest", "cell": lambda row: format_currency(row["interest"])},
-                        {"header": "Ending Balance", "accessor": "ending_balance", "cell": lambda row: format_currency(row["ending_balance"])},
-                    ],
-                    pagination=True,
-                    search=True,
-                    sort=True,
-                    selection_mode="single",
-                    highlight_on_hover=True,
-                    page_size=10,
+                State.schedule_months > 0,
+                rx.hstack(
+                    rx.input(
+                        placeholder="Filter by month or range, e.g. 12-24",
+                        value=ScheduleState.table_filter,
+                        on_change=ScheduleState.set_table_filter.debounce(300),
+                        width="50%",
+                    ),
+                    rx.spacer(),
+                    rx.select(
+                        ["month", "starting_balance", "payment", "principal", "interest", "ending_balance"],
+                        value=ScheduleState.table_sort_column,
+                        on_change=ScheduleState.sort_table,
+                        size="1",
+                    ),
+                    rx.button(
+                        rx.cond(ScheduleState.table_sort_descending, "Descending", "Ascending"),
+                        on_click=ScheduleState.sort_table(ScheduleState.table_sort_column),
+                        size="1",
+                    ),
+                    width="100%",
+                ),
+                rx.text(""),
+            ),
+            rx.cond(
+                State.schedule_months > 0,
+                rx.table.root(
+                    rx.table.header(
+                        rx.table.row(*[rx.table.column_header_cell(header) for header in SCHEDULE_HEADERS]),
+                    ),
+                    rx.table.body(rx.foreach(ScheduleState.amortization_table, schedule_row)),
+                    width="100%",
                 ),
                 rx.text("Calculate loan to see amortization schedule."),
             ),
+            rx.cond(
+                State.schedule_months > 0,
+                rx.hstack(
+                    rx.button("Previous", on_click=ScheduleState.prev_table_page, size="1"),
+                    rx.spacer(),
+                    rx.text(f"Page {ScheduleState.table_page + 1} of {ScheduleState.table_page_count} ({ScheduleState.table_row_count} months)"),
+                    rx.spacer(),
+                    rx.button("Next", on_click=ScheduleState.next_table_page, size="1"),
+                    width="100%",
+                ),
+                rx.text(""),
+            ),
             spacing="4",
             width="100%",
         ),
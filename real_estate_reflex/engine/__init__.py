@@ -0,0 +1 @@
+"""Calculation engines for the Real Estate Loan Calculator."""
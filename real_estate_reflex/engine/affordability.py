@@ -0,0 +1,106 @@
+"""Affordability solver: inverse loan queries answered for many payment budgets at once.
+
+Principal and term have closed-form inverses of the annuity formula; the
+rate does not, so it is found by bisection over a bracket, all targets
+in lockstep.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from real_estate_reflex.engine.batch import batch_monthly_payment
+
+# Bracket searched for the highest affordable rate, in annual percent
+MAX_SOLVER_RATE = 30.0
+
+# Bisection halvings; 50 narrows a 30% bracket well below 1e-12%
+RATE_SOLVER_ITERATIONS = 50
+
+AFFORDABILITY_QUERIES = ("max_principal", "max_rate", "min_term")
+
+
+def max_principal(payments: ArrayLike, annual_rates: ArrayLike, years: ArrayLike) -> np.ndarray:
+    """Largest principal each payment budget can carry at the given rate and term."""
+    payment, annual_rate, term = np.broadcast_arrays(
+        np.asarray(payments, dtype=float),
+        np.asarray(annual_rates, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    monthly_rate = annual_rate / 100 / 12
+    num_payments = term * 12
+
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    annuity = payment * (1 - (1 + safe_rate) ** -num_payments) / safe_rate
+    return np.where(zero_rate, payment * num_payments, annuity)
+
+
+def min_term_months(principals: ArrayLike, annual_rates: ArrayLike, payments: ArrayLike) -> np.ndarray:
+    """Fewest whole months in which each payment pays off the principal.
+
+    Budgets that do not cover the first month's interest never pay the loan
+    off and come back as ``inf``.
+    """
+    principal, annual_rate, payment = np.broadcast_arrays(
+        np.asarray(principals, dtype=float),
+        np.asarray(annual_rates, dtype=float),
+        np.asarray(payments, dtype=float),
+    )
+    monthly_rate = annual_rate / 100 / 12
+
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # n = -log(1 - P r / pmt) / log(1 + r)
+        coverage = 1 - principal * safe_rate / payment
+        months = np.where(coverage > 0, -np.log(np.where(coverage > 0, coverage, 1.0)) / np.log1p(safe_rate), np.inf)
+        months = np.where(zero_rate, principal / payment, months)
+    months = np.where(payment > 0, months, np.inf)
+    # Guard against 359.9999999 rounding up to an extra month
+    return np.ceil(np.round(months, 9))
+
+
+def max_rate(
+    principals: ArrayLike, payments: ArrayLike, years: ArrayLike, upper: float = MAX_SOLVER_RATE
+) -> np.ndarray:
+    """Highest annual rate (in percent) at which each payment still covers the loan.
+
+    The payment grows monotonically with the rate, so every target is
+    bisected inside ``[0, upper]`` at once. Budgets below the zero-rate
+    payment are infeasible and come back as NaN; budgets that cover even
+    ``upper`` come back as ``upper``.
+    """
+    principal, payment, term = np.broadcast_arrays(
+        np.asarray(principals, dtype=float),
+        np.asarray(payments, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    low = np.zeros(principal.shape)
+    high = np.full(principal.shape, float(upper))
+    # Rates within float epsilon of zero overflow the annuity to inf, which simply reads as unaffordable
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(RATE_SOLVER_ITERATIONS):
+            middle = (low + high) / 2
+            affordable = batch_monthly_payment(principal, middle, term) <= payment
+            low = np.where(affordable, middle, low)
+            high = np.where(affordable, high, middle)
+
+    rate = np.where(batch_monthly_payment(principal, upper, term) <= payment, float(upper), low)
+    return np.where(principal / (term * 12) <= payment, rate, np.nan)
+
+
+def affordability_curve(
+    query: str, budgets: ArrayLike, principal: float, annual_rate: float, years: int
+) -> np.ndarray:
+    """Answer one inverse query for every payment budget, holding the other two loan inputs fixed.
+
+    ``max_principal`` ignores ``principal``, ``max_rate`` ignores
+    ``annual_rate`` and ``min_term`` (in years) ignores ``years``.
+    """
+    if query == "max_principal":
+        return max_principal(budgets, annual_rate, years)
+    if query == "max_rate":
+        return max_rate(principal, budgets, years)
+    if query == "min_term":
+        return min_term_months(principal, annual_rate, budgets) / 12
+    raise ValueError(f"Unknown affordability query: {query}")
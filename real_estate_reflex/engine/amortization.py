@@ -0,0 +1,143 @@
+"""Vectorized amortization engine for fixed-rate loans."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def monthly_payment(principal: float, annual_rate: float, years: int) -> float:
+    """Calculate the monthly payment for a loan."""
+    if annual_rate == 0:
+        return principal / (years * 12)
+
+    monthly_rate = annual_rate / 100 / 12
+    num_payments = years * 12
+    growth = (1 + monthly_rate) ** num_payments
+    return principal * (monthly_rate * growth) / (growth - 1)
+
+
+SCHEDULE_COLUMNS = ("month", "starting_balance", "payment", "principal", "interest", "ending_balance")
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """Month-by-month amortization schedule held as parallel NumPy arrays.
+
+    Only the principal, interest and ending balance columns are stored; the
+    month number, payment and starting balance are derived on access.
+    Schedules whose payment changes over time (rate resets, prepayments)
+    also carry a per-month ``payments`` column.
+    """
+
+    principal: np.ndarray
+    interest: np.ndarray
+    ending_balance: np.ndarray
+    monthly_payment: float
+    total_interest: float
+    payments: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.principal)
+
+    @property
+    def month(self) -> np.ndarray:
+        return np.arange(1, len(self) + 1)
+
+    @property
+    def payment(self) -> np.ndarray:
+        if self.payments is not None:
+            return self.payments
+        return np.full(len(self), self.monthly_payment)
+
+    @property
+    def starting_balance(self) -> np.ndarray:
+        return self.ending_balance + self.principal
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the schedule arrays."""
+        columns = (self.principal, self.interest, self.ending_balance, self.payments)
+        return sum(column.nbytes for column in columns if column is not None)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Materialize rounded row dicts for the months in ``[start, stop)``."""
+        return self.rows_at(np.arange(len(self))[start:stop])
+
+    def rows_at(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """Materialize rounded row dicts for the given 0-based row positions, in order."""
+        principal = self.principal[positions]
+        ending_balance = self.ending_balance[positions]
+        columns = (
+            positions + 1,
+            np.round(ending_balance + principal, 2),
+            np.round(self.payment[positions], 2),
+            np.round(principal, 2),
+            np.round(self.interest[positions], 2),
+            np.round(ending_balance, 2),
+        )
+        return [
+            dict(zip(SCHEDULE_COLUMNS, values))
+            for values in zip(*(column.tolist() for column in columns))
+        ]
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Materialize the whole schedule as a list of rounded row dicts."""
+        return self.rows()
+
+
+def ending_balances(balance: float, monthly_rate: float, payment: float, months: int) -> np.ndarray:
+    """Balance after each of ``months`` constant payments, in closed form and without any final fix-up."""
+    month = np.arange(1, months + 1)
+
+    # Balance after m payments: B(1+r)^m - pmt * ((1+r)^m - 1) / r
+    if monthly_rate == 0:
+        return balance - payment * month
+    growth = (1 + monthly_rate) ** month.astype(float)
+    return balance * growth - payment * (growth - 1) / monthly_rate
+
+
+def amortize_balance(
+    balance: float, monthly_rate: float, payment: float, months: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Amortize a balance at a constant rate and payment for ``months`` months in closed form.
+
+    Returns the principal, interest and ending balance columns. The last
+    month absorbs any residual balance so the loan ends at exactly zero.
+    """
+    ending_balance = ending_balances(balance, monthly_rate, payment, months)
+
+    starting_balance = np.empty(months)
+    starting_balance[0] = balance
+    starting_balance[1:] = ending_balance[:-1]
+
+    interest = starting_balance * monthly_rate
+    principal_paid = payment - interest
+
+    # Handle final payment rounding issues
+    principal_paid[-1] += ending_balance[-1]
+    ending_balance[-1] = 0.0
+    return principal_paid, interest, ending_balance
+
+
+def freeze(*columns: np.ndarray):
+    """Mark schedule columns read-only so one schedule can be shared between sessions."""
+    for column in columns:
+        column.flags.writeable = False
+
+
+def amortization_schedule(principal: float, annual_rate: float, years: int) -> AmortizationSchedule:
+    """Compute the full amortization schedule in closed form."""
+    payment = monthly_payment(principal, annual_rate, years)
+    principal_paid, interest, ending_balance = amortize_balance(
+        principal, annual_rate / 100 / 12, payment, years * 12
+    )
+    freeze(principal_paid, interest, ending_balance)
+
+    return AmortizationSchedule(
+        principal=principal_paid,
+        interest=interest,
+        ending_balance=ending_balance,
+        monthly_payment=payment,
+        total_interest=float(interest.sum()),
+    )
@@ -0,0 +1,149 @@
+"""Adjustable-rate (ARM) engine: rate-path schedules computed segment by segment.
+
+Between two resets the rate and payment are constant, so each segment is
+amortized in closed form. Every operation is vectorized across rate paths:
+a batch of paths costs one pass per reset, not one pass per path.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from real_estate_reflex.engine.amortization import AmortizationSchedule, freeze
+from real_estate_reflex.engine.batch import balance_curves, batch_monthly_payment, interest_curves
+
+
+@dataclass(frozen=True)
+class ArmTerms:
+    """Rate terms of an adjustable-rate loan, in annual percent.
+
+    The initial rate holds for ``fixed_months``; the rate then resets every
+    ``reset_months`` to index + margin, limited to ``initial_cap`` at the
+    first reset and ``periodic_cap`` at later ones, to at most
+    ``lifetime_cap`` above the initial rate, and to no less than ``floor``
+    (the margin when omitted). With ``fixed_months=0`` the first reset falls
+    in the first month, so the initial rate is only the starting point for
+    the initial cap.
+    """
+
+    initial_rate: float
+    fixed_months: int = 60
+    reset_months: int = 12
+    margin: float = 2.75
+    initial_cap: float = 2.0
+    periodic_cap: float = 2.0
+    lifetime_cap: float = 5.0
+    floor: Optional[float] = None
+
+    def reset_schedule(self, months: int) -> np.ndarray:
+        """0-based months at which the rate resets within a term of ``months`` months."""
+        return np.arange(self.fixed_months, months, self.reset_months)
+
+
+@dataclass(frozen=True)
+class ArmPaths:
+    """Month-by-month ARM schedules for a batch of rate paths, as (paths x months) arrays."""
+
+    rates: np.ndarray
+    payments: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    ending_balance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the path arrays."""
+        return sum(
+            column.nbytes for column in (self.rates, self.payments, self.principal, self.interest, self.ending_balance)
+        )
+
+    @property
+    def total_interest(self) -> np.ndarray:
+        return self.interest.sum(axis=1)
+
+    @property
+    def payment_shock(self) -> np.ndarray:
+        """Highest payment on each path relative to the initial payment."""
+        return self.payments.max(axis=1) / self.payments[:, 0]
+
+    def schedule(self, path: int = 0) -> AmortizationSchedule:
+        """One path as an amortization schedule with a per-month payment column."""
+        return AmortizationSchedule(
+            principal=self.principal[path],
+            interest=self.interest[path],
+            ending_balance=self.ending_balance[path],
+            monthly_payment=float(self.payments[path, 0]),
+            total_interest=float(self.interest[path].sum()),
+            payments=self.payments[path],
+        )
+
+
+def reset_rates(terms: ArmTerms, index_paths: ArrayLike, months: int) -> np.ndarray:
+    """Annual rate in force each month along every index path, applying caps and floor at each reset.
+
+    ``index_paths`` holds index levels in percent, one row per path and one
+    column per month (a 1-D array is a single path); the index in the month
+    of a reset sets the new rate. Paths shorter than the term hold their
+    last value.
+    """
+    index = np.atleast_2d(np.asarray(index_paths, dtype=float))
+    floor = terms.margin if terms.floor is None else terms.floor
+    ceiling = terms.initial_rate + terms.lifetime_cap
+
+    rates = np.empty((len(index), months))
+    rate = np.full(len(index), float(terms.initial_rate))
+    resets = terms.reset_schedule(months)
+    starts = np.concatenate([[0], resets])
+    stops = np.append(resets, months)
+    for segment, (start, stop) in enumerate(zip(starts, stops)):
+        if segment > 0:
+            cap = terms.initial_cap if segment == 1 else terms.periodic_cap
+            target = index[:, min(start, index.shape[1] - 1)] + terms.margin
+            rate = np.clip(np.clip(target, rate - cap, rate + cap), floor, ceiling)
+        rates[:, start:stop] = rate[:, None]
+    return rates
+
+
+def arm_paths(principal: float, years: int, terms: ArmTerms, index_paths: ArrayLike) -> ArmPaths:
+    """Amortize a loan along every index path, re-amortizing the payment at each reset.
+
+    Each constant-rate segment is evaluated in closed form for all paths at
+    once from the balance left at its start.
+    """
+    months = years * 12
+    rates = reset_rates(terms, index_paths, months)
+    paths = len(rates)
+
+    payments = np.empty((paths, months))
+    interest = np.empty((paths, months))
+    ending_balance = np.empty((paths, months))
+    balance = np.full(paths, float(principal))
+    resets = terms.reset_schedule(months)
+    for start, stop in zip(np.concatenate([[0], resets]), np.append(resets, months)):
+        if stop == start:
+            # No fixed period: the first reset is at month 0, leaving the initial segment empty
+            continue
+        rate = rates[:, start]
+        remaining_years = (months - start) / 12
+        segment_months = np.arange(1, stop - start + 1)
+        # Re-amortize what is left over the remaining term at the segment's rate
+        payments[:, start:stop] = batch_monthly_payment(balance, rate, remaining_years)[:, None]
+        interest[:, start:stop] = interest_curves(balance, rate, np.full(paths, remaining_years), segment_months)
+        ending_balance[:, start:stop] = balance_curves(balance, rate, np.full(paths, remaining_years), segment_months)
+        balance = ending_balance[:, stop - 1]
+
+    starting_balance = np.concatenate([np.full((paths, 1), float(principal)), ending_balance[:, :-1]], axis=1)
+    principal_paid = starting_balance - ending_balance
+    freeze(rates, payments, principal_paid, interest, ending_balance)
+    return ArmPaths(
+        rates=rates,
+        payments=payments,
+        principal=principal_paid,
+        interest=interest,
+        ending_balance=ending_balance,
+    )
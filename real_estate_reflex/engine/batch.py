@@ -0,0 +1,84 @@
+"""Batch loan engine: payment and totals for many loans in one pass."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+@dataclass(frozen=True)
+class LoanSummaries:
+    """Per-loan payment totals for a batch of fixed-rate loans."""
+
+    monthly_payment: np.ndarray
+    total_interest: np.ndarray
+    total_payment: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.monthly_payment)
+
+
+def batch_monthly_payment(principals: ArrayLike, annual_rates: ArrayLike, years: ArrayLike) -> np.ndarray:
+    """Calculate the monthly payment for every loan in a batch.
+
+    Inputs are broadcast against each other, so a scalar rate or term can be
+    combined with an array of principals. Zero-rate loans and mixed terms are
+    handled in the same pass.
+    """
+    principal, annual_rate, term = np.broadcast_arrays(
+        np.asarray(principals, dtype=float),
+        np.asarray(annual_rates, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    monthly_rate = annual_rate / 100 / 12
+    num_payments = term * 12
+
+    zero_rate = monthly_rate == 0
+    # Substitute a harmless rate where it is zero so the annuity branch never divides by zero
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    growth = (1 + safe_rate) ** num_payments
+    annuity = principal * (safe_rate * growth) / (growth - 1)
+    return np.where(zero_rate, principal / num_payments, annuity)
+
+
+def loan_summaries(principals: ArrayLike, annual_rates: ArrayLike, years: ArrayLike) -> LoanSummaries:
+    """Calculate monthly payment, total interest and total payment for a batch of loans."""
+    principal = np.asarray(principals, dtype=float)
+    payment = batch_monthly_payment(principal, annual_rates, years)
+    total_payment = payment * np.asarray(years, dtype=float) * 12
+    return LoanSummaries(
+        monthly_payment=payment,
+        total_interest=total_payment - principal,
+        total_payment=total_payment,
+    )
+
+
+def balance_curves(principals: ArrayLike, annual_rates: ArrayLike, years: ArrayLike, months: ArrayLike) -> np.ndarray:
+    """Ending balance of every loan at the given 1-based months, as a (loans x months) array.
+
+    Loans are zero after their final month, so loans of different terms can
+    share one month axis.
+    """
+    principal = np.asarray(principals, dtype=float)[:, None]
+    monthly_rate = (np.asarray(annual_rates, dtype=float) / 100 / 12)[:, None]
+    num_payments = (np.asarray(years, dtype=float) * 12)[:, None]
+    month = np.asarray(months, dtype=float)[None, :]
+    payment = batch_monthly_payment(principals, annual_rates, years)[:, None]
+
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    growth = (1 + safe_rate) ** np.minimum(month, num_payments)
+    balance = np.where(
+        zero_rate,
+        principal - payment * month,
+        principal * growth - payment * (growth - 1) / safe_rate,
+    )
+    balance[(month >= num_payments) | (balance < 0)] = 0.0
+    return balance
+
+
+def interest_curves(principals: ArrayLike, annual_rates: ArrayLike, years: ArrayLike, months: ArrayLike) -> np.ndarray:
+    """Interest paid by every loan in the given 1-based months, as a (loans x months) array."""
+    # Interest in month m accrues on the balance left after month m - 1
+    starting_balance = balance_curves(principals, annual_rates, years, np.asarray(months, dtype=float) - 1)
+    return starting_balance * (np.asarray(annual_rates, dtype=float) / 100 / 12)[:, None]
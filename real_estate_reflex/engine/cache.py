@@ -0,0 +1,290 @@
+"""Process-wide LRU memoization of loan calculations.
+
+Schedules and summaries also read through the optional shared backend from
+``engine.store``, so identical loans are computed once across workers.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from real_estate_reflex import metrics
+from real_estate_reflex.engine.amortization import AmortizationSchedule, amortization_schedule, monthly_payment
+from real_estate_reflex.engine.batch import loan_summaries
+from real_estate_reflex.engine.charts import Series, schedule_chart_series
+from real_estate_reflex.engine.prepayment import Prepayment, PrepaymentResult, prepayment_schedule
+from real_estate_reflex.engine.sensitivity import SensitivityGrid, sensitivity_grid
+from real_estate_reflex.engine.store import (
+    RedisResultBackend,
+    backend_from_env,
+    decode_schedule,
+    decode_summary,
+    encode_schedule,
+    encode_summary,
+    loan_cache_key,
+)
+from real_estate_reflex.engine.table import ScheduleIndex
+
+LoanKey = Tuple[float, float, int]
+LoanSummary = Tuple[float, float, float]
+
+
+def normalize_loan_key(principal: float, annual_rate: float, years: int) -> LoanKey:
+    """Normalize loan inputs so equivalent values share one cache entry."""
+    return round(float(principal), 2), round(float(annual_rate), 6), int(years)
+
+
+def _size_of(value: Any) -> int:
+    """Estimate the memory held by a cached value."""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size_of(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and by approximate memory."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for a key, computing and storing it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Any:
+        """Return the cached value for a key, or None, without counting a lookup or refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries to stay within bounds."""
+        size = _size_of(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+schedule_cache = LRUCache(max_entries=256, max_bytes=32 * 1024 * 1024)
+payment_cache = LRUCache(max_entries=4096, max_bytes=1024 * 1024)
+summary_cache = LRUCache(max_entries=4096, max_bytes=2 * 1024 * 1024)
+chart_series_cache = LRUCache(max_entries=256, max_bytes=32 * 1024 * 1024)
+index_cache = LRUCache(max_entries=256, max_bytes=16 * 1024 * 1024)
+sensitivity_cache = LRUCache(max_entries=64, max_bytes=16 * 1024 * 1024)
+prepayment_cache = LRUCache(max_entries=256, max_bytes=16 * 1024 * 1024)
+
+# Every process-wide cache by name, for metrics and for clearing
+CACHES: Dict[str, LRUCache] = {
+    "schedule": schedule_cache,
+    "payment": payment_cache,
+    "summary": summary_cache,
+    "chart_series": chart_series_cache,
+    "index": index_cache,
+    "sensitivity": sensitivity_cache,
+    "prepayment": prepayment_cache,
+}
+
+
+# Shared backend behind the local caches; None keeps results process-local
+shared_backend: Optional[RedisResultBackend] = backend_from_env()
+
+
+def set_shared_backend(backend: Optional[RedisResultBackend]):
+    """Swap the shared result backend, e.g. for an in-memory stand-in in tests."""
+    global shared_backend
+    shared_backend = backend
+
+
+def _read_through(kind: str, key: LoanKey, compute: Callable[[], Any], encode, decode) -> Any:
+    """Load a result from the shared backend, or compute it and publish it there."""
+    if shared_backend is None:
+        return compute()
+    store_key = loan_cache_key(kind, key)
+    data = shared_backend.get(store_key)
+    if data is not None:
+        return decode(data)
+    value = compute()
+    shared_backend.set(store_key, encode(value))
+    return value
+
+
+def _compute_schedule(key: LoanKey) -> AmortizationSchedule:
+    """Build a schedule and record its size."""
+    schedule = amortization_schedule(*key)
+    metrics.observe_schedule(len(schedule), schedule.nbytes)
+    return schedule
+
+
+def cached_schedule(principal: float, annual_rate: float, years: int) -> AmortizationSchedule:
+    """Return the amortization schedule for a loan, shared across sessions and workers."""
+    key = normalize_loan_key(principal, annual_rate, years)
+    return schedule_cache.get_or_compute(
+        key,
+        lambda: _read_through("schedule", key, lambda: _compute_schedule(key), encode_schedule, decode_schedule),
+    )
+
+
+def cached_loan_summaries(principals: Sequence[float], annual_rates: Sequence[float], years: Sequence[int]) -> List[LoanSummary]:
+    """Return (monthly payment, total interest, total payment) per loan, shared across workers.
+
+    Local hits are served first, remaining loans are fetched from the shared
+    backend in one round trip, and whatever is still missing is computed in
+    one batched pass.
+    """
+    keys = [normalize_loan_key(*loan) for loan in zip(principals, annual_rates, years)]
+    results: List[Optional[LoanSummary]] = [summary_cache.get(key) for key in keys]
+    missing = [position for position, result in enumerate(results) if result is None]
+
+    if missing and shared_backend is not None:
+        stored = shared_backend.get_many([loan_cache_key("summary", keys[position]) for position in missing])
+        for position, data in zip(missing, stored):
+            if data is not None:
+                results[position] = decode_summary(data)
+                summary_cache.put(keys[position], results[position])
+        missing = [position for position in missing if results[position] is None]
+
+    if missing:
+        summaries = loan_summaries(*zip(*(keys[position] for position in missing)))
+        for row, position in enumerate(missing):
+            summary = (
+                float(summaries.monthly_payment[row]),
+                float(summaries.total_interest[row]),
+                float(summaries.total_payment[row]),
+            )
+            results[position] = summary
+            summary_cache.put(keys[position], summary)
+            if shared_backend is not None:
+                shared_backend.set(loan_cache_key("summary", keys[position]), encode_summary(summary))
+    return results
+
+
+def cached_loan_summary(principal: float, annual_rate: float, years: int) -> LoanSummary:
+    """Return (monthly payment, total interest, total payment) for one loan."""
+    return cached_loan_summaries([principal], [annual_rate], [years])[0]
+
+
+def cached_monthly_payment(principal: float, annual_rate: float, years: int) -> float:
+    """Return the monthly payment for a loan, memoized on normalized inputs."""
+    key = normalize_loan_key(principal, annual_rate, years)
+    return payment_cache.get_or_compute(key, lambda: monthly_payment(*key))
+
+
+def cached_chart_series(principal: float, annual_rate: float, years: int) -> Dict[str, Series]:
+    """Return the downsampled chart series for a loan, derived once per schedule."""
+    key = normalize_loan_key(principal, annual_rate, years)
+    return chart_series_cache.get_or_compute(key, lambda: schedule_chart_series(cached_schedule(*key)))
+
+
+def cached_schedule_index(principal: float, annual_rate: float, years: int) -> ScheduleIndex:
+    """Return the table sort index for a loan's schedule, shared across sessions."""
+    key = normalize_loan_key(principal, annual_rate, years)
+    return index_cache.get_or_compute(key, lambda: ScheduleIndex(cached_schedule(*key)))
+
+
+def cached_sensitivity_grid(principal: float) -> SensitivityGrid:
+    """Return the default rate x term sensitivity grid for a loan amount, computed once per amount."""
+    key = round(float(principal), 2)
+    return sensitivity_cache.get_or_compute(key, lambda: sensitivity_grid(key))
+
+
+PrepaymentKey = Tuple[LoanKey, Tuple[Prepayment, ...]]
+
+
+def prepayment_cache_key(
+    principal: float, annual_rate: float, years: int, prepayments: Sequence[Prepayment]
+) -> PrepaymentKey:
+    """Key of a prepayment schedule in the cache: the normalized loan and its prepayments."""
+    return normalize_loan_key(principal, annual_rate, years), tuple(prepayments)
+
+
+def cached_prepayment_schedule(
+    principal: float,
+    annual_rate: float,
+    years: int,
+    prepayments: Sequence[Prepayment],
+    previous_key: Optional[PrepaymentKey] = None,
+) -> PrepaymentResult:
+    """Return the prepayment schedule for a loan and set of prepayments, shared across sessions.
+
+    ``previous_key`` names the caller's last result; when it is still cached
+    and for the same loan, only the months from the first changed extra
+    payment onward are recomputed.
+    """
+    key = prepayment_cache_key(principal, annual_rate, years, prepayments)
+    loan_key, prepayments = key
+
+    def compute() -> PrepaymentResult:
+        previous = None
+        if previous_key is not None and previous_key[0] == loan_key:
+            previous = prepayment_cache.peek(previous_key)
+        result = prepayment_schedule(*loan_key, prepayments, previous=previous)
+        metrics.observe_schedule(result.payoff_month, result.nbytes, kind="prepayment")
+        return result
+
+    return prepayment_cache.get_or_compute(key, compute)
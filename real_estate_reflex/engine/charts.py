@@ -0,0 +1,98 @@
+"""Chart-series pipeline: per-schedule x/y arrays with shape-preserving downsampling."""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from real_estate_reflex.engine.amortization import AmortizationSchedule
+from real_estate_reflex.engine.batch import balance_curves, interest_curves
+
+# Upper bound on points per chart trace, whatever the loan term
+CHART_MAX_POINTS = 200
+
+# Upper bound on points across all traces of a scenario overlay chart
+OVERLAY_POINT_BUDGET = 4000
+
+# Fewest points per overlay trace, however many scenarios are compared
+OVERLAY_MIN_POINTS = 24
+
+Series = Tuple[List[float], List[float]]
+
+# One shared x-axis and a y series per scenario
+OverlaySeries = Tuple[List[int], List[List[float]]]
+
+OVERLAY_CURVES = {"balance": balance_curves, "interest": interest_curves}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Pick ``threshold`` points that preserve the shape of a series (Largest-Triangle-Three-Buckets).
+
+    The first and last points are always kept. Series already within the
+    threshold are returned whole.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+            avg_x, avg_y = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:stop] - y[anchor])
+            - (x[anchor] - x[start:stop]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        indices[bucket + 1] = anchor
+    return indices
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int = CHART_MAX_POINTS) -> Series:
+    """Downsample a series with LTTB and round the values for display."""
+    keep = lttb_indices(x, y, max_points)
+    return x[keep].tolist(), np.round(y[keep], 2).tolist()
+
+
+def schedule_chart_series(schedule: AmortizationSchedule, max_points: int = CHART_MAX_POINTS) -> Dict[str, Series]:
+    """Compute the downsampled principal, interest and balance series for a schedule."""
+    month = schedule.month
+    return {
+        "principal": downsample(month, schedule.principal, max_points),
+        "interest": downsample(month, schedule.interest, max_points),
+        "balance": downsample(month, schedule.ending_balance, max_points),
+    }
+
+
+def shared_month_grid(max_months: int, traces: int = 1) -> np.ndarray:
+    """Evenly spaced months over ``[1, max_months]`` shared by every trace of an overlay chart.
+
+    The number of points per trace shrinks as traces are added so the whole
+    chart stays within ``OVERLAY_POINT_BUDGET`` points.
+    """
+    points = min(CHART_MAX_POINTS, max(OVERLAY_MIN_POINTS, OVERLAY_POINT_BUDGET // max(traces, 1)))
+    return np.unique(np.linspace(1, max_months, min(points, max_months)).round().astype(int))
+
+
+def scenario_overlay_series(
+    principals: ArrayLike, annual_rates: ArrayLike, years: Sequence[int]
+) -> Dict[str, OverlaySeries]:
+    """Balance and interest curves for many loans, sampled on one shared month grid.
+
+    All curves are evaluated in closed form for every loan at once; loans
+    shorter than the longest term read zero after their final month.
+    """
+    month = shared_month_grid(int(max(years)) * 12, len(years))
+    return {
+        curve: (month.tolist(), np.round(evaluate(principals, annual_rates, years, month), 2).tolist())
+        for curve, evaluate in OVERLAY_CURVES.items()
+    }
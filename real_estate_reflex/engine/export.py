@@ -0,0 +1,33 @@
+"""Streaming CSV export of amortization schedules."""
+
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator
+
+from real_estate_reflex.engine.amortization import SCHEDULE_COLUMNS, AmortizationSchedule
+
+
+def iter_schedule_csv(schedule: AmortizationSchedule, chunk_rows: int = 1000) -> Iterator[bytes]:
+    """Yield the schedule as CSV, one encoded chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(SCHEDULE_COLUMNS)
+    for start in range(0, len(schedule), chunk_rows):
+        writer.writerows(row.values() for row in schedule.rows(start, start + chunk_rows))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty schedule
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a stream of byte chunks without buffering the whole stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
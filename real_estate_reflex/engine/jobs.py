@@ -0,0 +1,139 @@
+"""Process-pool execution of long-running calculation jobs.
+
+Jobs run in worker processes so that heavy NumPy work never holds the
+server's event loop; the async helpers here are awaited from Reflex
+background tasks, which report progress into state between units of work.
+"""
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional, TextIO, Tuple
+
+from real_estate_reflex.engine.portfolio import PortfolioTotals, amortize_chunk_job, read_loan_chunks
+from real_estate_reflex.engine.simulation import (
+    SIMULATION_MEMORY_BUDGET,
+    SimulationResult,
+    SimulationSpec,
+    simulate_chunk_job,
+    simulation_chunks,
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def job_workers() -> int:
+    """Number of job worker processes.
+
+    Defaults to one less than the CPU count and can be set with the
+    ``REAL_ESTATE_JOB_WORKERS`` environment variable.
+    """
+    return int(os.environ.get("REAL_ESTATE_JOB_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared job pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        # Spawned workers do not inherit the server's event loop or sockets
+        _pool = ProcessPoolExecutor(max_workers=job_workers(), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_process_pool():
+    """Stop the shared job pool, cancelling work that has not started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+@contextlib.asynccontextmanager
+async def process_pool_lifespan():
+    """App lifespan task that stops the job pool when the server stops or hot-reloads."""
+    try:
+        yield
+    finally:
+        shutdown_process_pool()
+
+
+async def run_in_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a picklable function in the job pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(fn, *args))
+
+
+async def amortize_portfolio_in_pool(
+    path: Path,
+    summary_out: Optional[TextIO] = None,
+    chunk_rows: int = 5000,
+) -> AsyncIterator[Tuple[int, PortfolioTotals]]:
+    """Amortize a loan file chunk by chunk in the job pool.
+
+    Yields ``(rows_done, totals)`` after each chunk so the caller can report
+    progress or stop early; stopping cancels chunks that have not started.
+    At most two chunks per worker are in flight, which bounds memory.
+    """
+    max_in_flight = 2 * job_workers()
+    reader = read_loan_chunks(path, chunk_rows)
+    pending: deque = deque()
+    totals = PortfolioTotals()
+    rows_read = rows_done = 0
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = await asyncio.to_thread(next, reader, None)
+                if chunk is None:
+                    break
+                pending.append((len(chunk), asyncio.ensure_future(run_in_pool(amortize_chunk_job, chunk, rows_read))))
+                rows_read += len(chunk)
+            if not pending:
+                break
+
+            chunk_len, future = pending.popleft()
+            summaries, chunk_totals = await future
+            totals.merge(chunk_totals)
+            if summary_out is not None:
+                await asyncio.to_thread(summaries.to_csv, summary_out, index=False, header=rows_done == 0)
+            rows_done += chunk_len
+            yield rows_done, totals
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+async def simulate_loan_in_pool(
+    spec: SimulationSpec,
+    memory_budget: int = SIMULATION_MEMORY_BUDGET,
+) -> AsyncIterator[Tuple[int, SimulationResult]]:
+    """Run a Monte Carlo simulation chunk by chunk in the job pool.
+
+    Yields ``(paths_done, chunk_result)`` in path order as chunks finish;
+    stopping cancels chunks that have not started. At most two chunks per
+    worker are in flight, so memory stays within about twice the budget per
+    worker. Results match ``simulate_loan`` for the same spec.
+    """
+    max_in_flight = 2 * job_workers()
+    chunks = simulation_chunks(spec, memory_budget)
+    pending: deque = deque()
+    paths_done = 0
+    try:
+        while True:
+            for blocks in chunks:
+                pending.append(asyncio.ensure_future(run_in_pool(simulate_chunk_job, spec, blocks)))
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+
+            result = await pending.popleft()
+            paths_done += len(result)
+            yield paths_done, result
+    finally:
+        for future in pending:
+            future.cancel()
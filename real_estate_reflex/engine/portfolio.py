@@ -0,0 +1,237 @@
+"""Chunked amortization of whole loan books read from CSV or Parquet files.
+
+Run from the command line with::
+
+    python -m real_estate_reflex.engine.portfolio loans.csv --summary summary.csv --runoff runoff.csv
+
+pandas is imported only when a loan file is read, so importing this module
+(as the app and the job pool do at startup) stays cheap.
+"""
+
+import argparse
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional, TextIO, Tuple
+
+import numpy as np
+
+from real_estate_reflex.engine.batch import batch_monthly_payment
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAX_TERM_MONTHS = 50 * 12
+
+SUMMARY_COLUMNS = ("loan_id", "principal", "annual_rate", "years", "monthly_payment", "total_interest", "total_payment")
+
+# Accepted spellings for the input columns, mapped to the canonical names
+COLUMN_ALIASES = {
+    "loan_amount": "principal",
+    "rate": "annual_rate",
+    "annual_interest_rate": "annual_rate",
+    "term_years": "years",
+    "loan_term_years": "years",
+    "id": "loan_id",
+}
+
+
+@dataclass
+class PortfolioTotals:
+    """Running portfolio aggregates, indexed by month where applicable."""
+
+    loan_count: int = 0
+    skipped_rows: int = 0
+    total_principal: float = 0.0
+    total_interest: float = 0.0
+    total_payment: float = 0.0
+    balance_by_month: np.ndarray = field(default_factory=lambda: np.zeros(MAX_TERM_MONTHS))
+    interest_by_month: np.ndarray = field(default_factory=lambda: np.zeros(MAX_TERM_MONTHS))
+    principal_by_month: np.ndarray = field(default_factory=lambda: np.zeros(MAX_TERM_MONTHS))
+
+    def merge(self, other: "PortfolioTotals"):
+        """Add another set of totals, e.g. from a chunk computed in a worker process."""
+        self.loan_count += other.loan_count
+        self.skipped_rows += other.skipped_rows
+        self.total_principal += other.total_principal
+        self.total_interest += other.total_interest
+        self.total_payment += other.total_payment
+        self.balance_by_month += other.balance_by_month
+        self.interest_by_month += other.interest_by_month
+        self.principal_by_month += other.principal_by_month
+
+    @property
+    def months(self) -> int:
+        """Number of months until the last loan in the book is paid off."""
+        remaining = np.nonzero(self.principal_by_month)[0]
+        return int(remaining[-1]) + 1 if len(remaining) else 0
+
+
+def read_loan_chunks(path: Path, chunk_rows: int = 5000) -> Iterator["pd.DataFrame"]:
+    """Read a loan file in chunks of at most ``chunk_rows`` rows."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Reading Parquet loan files requires pyarrow: pip install pyarrow") from error
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def count_loan_rows(path: Path) -> int:
+    """Count the loans in a file without parsing it, for progress reporting."""
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    lines = 0
+    last_block = b""
+    with open(path, "rb") as loans:
+        while block := loans.read(1024 * 1024):
+            lines += block.count(b"\n")
+            last_block = block
+    if last_block and not last_block.endswith(b"\n"):
+        lines += 1
+    # The first line is the header
+    return max(lines - 1, 0)
+
+
+def _normalize_chunk(chunk: "pd.DataFrame", first_row: int) -> "pd.DataFrame":
+    """Rename aliased columns and add row-number loan ids when none are given."""
+    chunk = chunk.rename(columns=lambda name: COLUMN_ALIASES.get(name.strip().lower(), name.strip().lower()))
+    missing = {"principal", "annual_rate", "years"} - set(chunk.columns)
+    if missing:
+        raise ValueError(f"Loan file is missing columns: {', '.join(sorted(missing))}")
+    if "loan_id" not in chunk.columns:
+        chunk["loan_id"] = np.arange(first_row + 1, first_row + len(chunk) + 1)
+    return chunk
+
+
+def amortize_chunk(chunk: "pd.DataFrame", totals: PortfolioTotals) -> "pd.DataFrame":
+    """Amortize one chunk of loans, add it to the running totals and return per-loan summaries."""
+    import pandas as pd
+
+    principal = pd.to_numeric(chunk["principal"], errors="coerce").to_numpy(dtype=float)
+    annual_rate = pd.to_numeric(chunk["annual_rate"], errors="coerce").to_numpy(dtype=float)
+    years = pd.to_numeric(chunk["years"], errors="coerce").to_numpy(dtype=float)
+
+    valid = (principal > 0) & (annual_rate >= 0) & (years >= 1) & (years <= 50) & (years == np.floor(years))
+    totals.skipped_rows += int((~valid).sum())
+    principal, annual_rate, years = principal[valid], annual_rate[valid], years[valid].astype(int)
+    loan_id = chunk["loan_id"].to_numpy()[valid]
+    if not len(principal):
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    payment = batch_monthly_payment(principal, annual_rate, years)
+    num_payments = years * 12
+    total_payment = payment * num_payments
+    total_interest = total_payment - principal
+
+    # Ending balance of every loan at every month, as a (loans x months) block
+    monthly_rate = annual_rate / 100 / 12
+    month = np.arange(1, num_payments.max(initial=0) + 1)
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)[:, None]
+    growth = (1 + safe_rate) ** month
+    balance = np.where(
+        zero_rate[:, None],
+        principal[:, None] - payment[:, None] * month,
+        principal[:, None] * growth - payment[:, None] * (growth - 1) / safe_rate,
+    )
+    balance[month >= num_payments[:, None]] = 0.0
+
+    starting_balance = np.concatenate([principal[:, None], balance[:, :-1]], axis=1)
+    interest = np.where(zero_rate[:, None], 0.0, starting_balance * safe_rate)
+
+    span = len(month)
+    totals.balance_by_month[:span] += balance.sum(axis=0)
+    totals.interest_by_month[:span] += interest.sum(axis=0)
+    totals.principal_by_month[:span] += (starting_balance - balance).sum(axis=0)
+    totals.loan_count += len(principal)
+    totals.total_principal += float(principal.sum())
+    totals.total_interest += float(total_interest.sum())
+    totals.total_payment += float(total_payment.sum())
+
+    return pd.DataFrame({
+        "loan_id": loan_id,
+        "principal": principal,
+        "annual_rate": annual_rate,
+        "years": years,
+        "monthly_payment": np.round(payment, 2),
+        "total_interest": np.round(total_interest, 2),
+        "total_payment": np.round(total_payment, 2),
+    }, columns=SUMMARY_COLUMNS)
+
+
+def amortize_chunk_job(chunk: "pd.DataFrame", first_row: int) -> Tuple["pd.DataFrame", PortfolioTotals]:
+    """Amortize one raw chunk on its own totals; the unit of work sent to worker processes."""
+    totals = PortfolioTotals()
+    summaries = amortize_chunk(_normalize_chunk(chunk, first_row), totals)
+    return summaries, totals
+
+
+def amortize_portfolio(
+    path: Path,
+    summary_out: Optional[TextIO] = None,
+    chunk_rows: int = 5000,
+) -> PortfolioTotals:
+    """Amortize every loan in a file, streaming per-loan summaries to ``summary_out``.
+
+    Memory is bounded by ``chunk_rows`` rather than by the size of the book.
+    """
+    totals = PortfolioTotals()
+    first_row = 0
+    for chunk in read_loan_chunks(path, chunk_rows):
+        summaries = amortize_chunk(_normalize_chunk(chunk, first_row), totals)
+        if summary_out is not None:
+            summaries.to_csv(summary_out, index=False, header=first_row == 0)
+        first_row += len(chunk)
+    return totals
+
+
+def write_runoff(totals: PortfolioTotals, out: TextIO):
+    """Write the month-by-month portfolio runoff as CSV."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(("month", "principal", "interest", "ending_balance"))
+    for month in range(totals.months):
+        writer.writerow((
+            month + 1,
+            round(float(totals.principal_by_month[month]), 2),
+            round(float(totals.interest_by_month[month]), 2),
+            round(float(totals.balance_by_month[month]), 2),
+        ))
+
+
+def main(argv: Optional[list] = None):
+    """Command-line entry point for portfolio runs."""
+    parser = argparse.ArgumentParser(description="Amortize a loan book from a CSV or Parquet file.")
+    parser.add_argument("loans", type=Path, help="CSV or Parquet file with principal, annual_rate and years columns")
+    parser.add_argument("--summary", type=Path, help="write per-loan summaries to this CSV file")
+    parser.add_argument("--runoff", type=Path, help="write the monthly portfolio runoff to this CSV file")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="loans processed per chunk")
+    args = parser.parse_args(argv)
+
+    summary_out = open(args.summary, "w", newline="") if args.summary else None
+    try:
+        totals = amortize_portfolio(args.loans, summary_out, args.chunk_rows)
+    finally:
+        if summary_out is not None:
+            summary_out.close()
+
+    if args.runoff:
+        with open(args.runoff, "w", newline="") as runoff_out:
+            write_runoff(totals, runoff_out)
+
+    print(f"Loans: {totals.loan_count:,} (skipped {totals.skipped_rows:,} invalid rows)")
+    print(f"Total principal: ${totals.total_principal:,.2f}")
+    print(f"Total interest: ${totals.total_interest:,.2f}")
+    print(f"Total payment: ${totals.total_payment:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Prepayment engine: fixed-rate schedules with extra principal payments.
+
+Extra payments break the single closed form, but between two changes in
+the extra amount the total payment is constant again. The schedule is
+therefore built segment by segment: each run of months with the same
+payment is amortized in closed form, and the loan stops in the month its
+balance reaches zero.
+
+Every result keeps the extra payment per month it was built with. Given the
+previous result for the same loan, a new schedule reuses the months before
+the first changed extra payment and recomputes only the tail from the
+balance checkpoint there.
+"""
+
+import math
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from real_estate_reflex.engine.amortization import AmortizationSchedule, ending_balances, freeze, monthly_payment
+
+# Balances below half a cent count as paid off, so float residue never adds a month
+PAID_OFF_BALANCE = 0.005
+
+
+@dataclass(frozen=True)
+class Prepayment:
+    """An extra principal payment of ``amount`` made in ``month`` (1-based).
+
+    ``every`` repeats it every that many months (1 for a recurring monthly
+    extra, 12 for a yearly lump sum, 0 for a one-off) until ``until``
+    (inclusive) or the end of the loan.
+    """
+
+    amount: float
+    month: int = 1
+    every: int = 0
+    until: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PrepaymentResult:
+    """A prepayment schedule together with what the prepayments saved against the base loan."""
+
+    schedule: AmortizationSchedule
+    base_total_interest: float
+    base_months: int
+    # Extra principal scheduled for each month of the term; the checkpoint for recomputing a tail
+    extra: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.schedule.nbytes + (self.extra.nbytes if self.extra is not None else 0)
+
+    @property
+    def payoff_month(self) -> int:
+        return len(self.schedule)
+
+    @property
+    def months_saved(self) -> int:
+        return self.base_months - self.payoff_month
+
+    @property
+    def interest_saved(self) -> float:
+        return self.base_total_interest - self.schedule.total_interest
+
+
+def parse_lump_sums(text: str) -> Optional[List[Prepayment]]:
+    """Parse one-off lump sums written as ``month:amount`` pairs, e.g. ``"60:10000, 120:5000"``.
+
+    Empty text means no lump sums; malformed text, including a negative or
+    non-finite amount, returns None.
+    """
+    lump_sums = []
+    for item in text.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        month, separator, amount = item.partition(":")
+        try:
+            lump_sum = Prepayment(amount=float(amount), month=int(month))
+        except ValueError:
+            return None
+        if not separator or not math.isfinite(lump_sum.amount) or lump_sum.amount < 0 or lump_sum.month < 1:
+            return None
+        lump_sums.append(lump_sum)
+    return lump_sums
+
+
+def extra_payments(prepayments: Sequence[Prepayment], months: int) -> np.ndarray:
+    """Total extra principal scheduled for each month of the loan term."""
+    extra = np.zeros(months)
+    for prepayment in prepayments:
+        if prepayment.amount < 0:
+            raise ValueError(f"Prepayment amounts must not be negative, got {prepayment.amount}")
+        if not 1 <= prepayment.month <= months:
+            continue
+        stop = months if prepayment.until is None else min(prepayment.until, months)
+        if prepayment.every > 0:
+            extra[prepayment.month - 1:stop:prepayment.every] += prepayment.amount
+        else:
+            extra[prepayment.month - 1] += prepayment.amount
+    return extra
+
+
+def prepayment_schedule(
+    principal: float,
+    annual_rate: float,
+    years: int,
+    prepayments: Sequence[Prepayment],
+    previous: Optional[PrepaymentResult] = None,
+) -> PrepaymentResult:
+    """Amortize a fixed-rate loan with extra principal payments, ending as soon as it is paid off.
+
+    The scheduled payment stays fixed; prepayments shorten the term rather
+    than lowering the payment. ``previous`` is an earlier result for the
+    same loan under other prepayments: months before the first one whose
+    extra payment differs are reused from it and only the tail is computed.
+    """
+    months = years * 12
+    monthly_rate = annual_rate / 100 / 12
+    payment = monthly_payment(principal, annual_rate, years)
+    extra = extra_payments(prepayments, months)
+    freeze(extra)
+
+    first = 0
+    if previous is not None and previous.extra is not None and previous.base_months == months:
+        changed = np.flatnonzero(previous.extra != extra)
+        first = int(changed[0]) if len(changed) else months
+        if first >= previous.payoff_month:
+            # Nothing changes before the loan was paid off
+            return replace(previous, extra=extra)
+    prefix = previous.schedule if first else None
+
+    # Segment starts: the first recomputed month and every later month where the extra amount changes
+    starts = np.concatenate([[first], first + np.flatnonzero(np.diff(extra[first:])) + 1])
+    stops = np.append(starts[1:], months)
+
+    principal_parts: List[np.ndarray] = [prefix.principal[:first]] if prefix is not None else []
+    interest_parts: List[np.ndarray] = [prefix.interest[:first]] if prefix is not None else []
+    balance_parts: List[np.ndarray] = [prefix.ending_balance[:first]] if prefix is not None else []
+    payment_parts: List[np.ndarray] = [prefix.payment[:first]] if prefix is not None else []
+    balance = float(prefix.ending_balance[first - 1]) if prefix is not None else float(principal)
+    for start, stop in zip(starts, stops):
+        segment_payment = payment + extra[start]
+        ending_balance = ending_balances(balance, monthly_rate, segment_payment, stop - start)
+        starting_balance = np.concatenate([[balance], ending_balance[:-1]])
+        interest = starting_balance * monthly_rate
+        payments = np.full(len(ending_balance), segment_payment)
+
+        paid_off = np.flatnonzero(ending_balance < PAID_OFF_BALANCE)
+        if len(paid_off) or stop == months:
+            # The last month pays whatever is left, so the loan ends at exactly zero
+            last = paid_off[0] if len(paid_off) else len(ending_balance) - 1
+            ending_balance, interest, payments = ending_balance[:last + 1], interest[:last + 1], payments[:last + 1]
+            starting_balance = starting_balance[:last + 1]
+            payments[-1] = starting_balance[-1] + interest[-1]
+            ending_balance[-1] = 0.0
+
+        principal_parts.append(payments - interest)
+        interest_parts.append(interest)
+        balance_parts.append(ending_balance)
+        payment_parts.append(payments)
+        balance = float(ending_balance[-1])
+        if balance == 0.0:
+            break
+
+    principal_paid = np.concatenate(principal_parts)
+    interest = np.concatenate(interest_parts)
+    ending_balance = np.concatenate(balance_parts)
+    payments = np.concatenate(payment_parts)
+    freeze(principal_paid, interest, ending_balance, payments)
+
+    schedule = AmortizationSchedule(
+        principal=principal_paid,
+        interest=interest,
+        ending_balance=ending_balance,
+        monthly_payment=payment,
+        total_interest=float(interest.sum()),
+        payments=payments,
+    )
+    return PrepaymentResult(
+        schedule=schedule,
+        base_total_interest=payment * months - principal,
+        base_months=months,
+        extra=extra,
+    )
@@ -0,0 +1,57 @@
+"""Rate x term sensitivity grids: payment and interest for every combination in one broadcast."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from real_estate_reflex.engine.batch import loan_summaries
+
+# Default grid axes: 0.1% to 20% in 0.1% steps, and every whole term from 1 to 50 years
+SENSITIVITY_RATES = np.round(np.arange(1, 201) * 0.1, 1)
+SENSITIVITY_TERMS = np.arange(1, 51)
+
+SENSITIVITY_METRICS = ("monthly_payment", "total_interest")
+
+
+@dataclass(frozen=True)
+class SensitivityGrid:
+    """Monthly payment and total interest of one loan amount over a rates x terms grid.
+
+    Rows follow ``rates`` and columns follow ``terms``.
+    """
+
+    principal: float
+    rates: np.ndarray
+    terms: np.ndarray
+    monthly_payment: np.ndarray
+    total_interest: np.ndarray
+
+    @property
+    def shape(self):
+        return self.monthly_payment.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the grid arrays."""
+        return sum(
+            column.nbytes for column in (self.rates, self.terms, self.monthly_payment, self.total_interest)
+        )
+
+
+def sensitivity_grid(
+    principal: float, rates: ArrayLike = SENSITIVITY_RATES, terms: ArrayLike = SENSITIVITY_TERMS
+) -> SensitivityGrid:
+    """Evaluate the annuity formula for every (rate, term) pair in a single broadcast pass."""
+    rates = np.array(rates, dtype=float)
+    terms = np.array(terms, dtype=float)
+    summaries = loan_summaries(principal, rates[:, None], terms[None, :])
+    for column in (rates, terms, summaries.monthly_payment, summaries.total_interest):
+        column.flags.writeable = False
+    return SensitivityGrid(
+        principal=float(principal),
+        rates=rates,
+        terms=terms,
+        monthly_payment=summaries.monthly_payment,
+        total_interest=summaries.total_interest,
+    )
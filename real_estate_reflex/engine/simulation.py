@@ -0,0 +1,185 @@
+"""Monte Carlo simulation of rate paths and prepayments for one loan.
+
+Paths are simulated in fixed-size blocks, each seeded from its own child of
+``np.random.SeedSequence(seed)``. Results are therefore reproducible for a
+given seed however the blocks are grouped into chunks, and whether chunks
+run in this process or in the job pool (``engine.jobs``). Blocks are
+grouped into chunks that stay within a memory budget.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from real_estate_reflex.engine.arm import ArmTerms, arm_paths
+
+# Paths drawn from one child seed; the unit of reproducibility
+SIMULATION_BLOCK_PATHS = 1024
+
+# Default memory budget for the arrays of one chunk
+SIMULATION_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Float64 (paths x months) arrays alive at once while a chunk is simulated
+_ARRAYS_PER_PATH_MONTH = 12
+
+SIMULATION_PERCENTILES = (5, 25, 50, 75, 95)
+
+Block = Tuple[np.random.SeedSequence, int]
+
+
+@dataclass(frozen=True)
+class RateModel:
+    """Mean-reverting (Ornstein-Uhlenbeck) model of the rate index, in annual percent.
+
+    ``reversion`` is the yearly pull towards ``mean`` and ``volatility``
+    the yearly standard deviation of index moves, in percentage points.
+    """
+
+    start: float = 3.0
+    mean: float = 3.5
+    reversion: float = 0.2
+    volatility: float = 1.0
+
+
+@dataclass(frozen=True)
+class PrepaymentModel:
+    """Full-payoff (refinance or sale) model as an annual conditional prepayment rate.
+
+    The rate rises by ``refinance_cpr`` for every percentage point the loan
+    rate exceeds the market rate (index + margin), up to ``max_cpr``.
+    """
+
+    base_cpr: float = 0.06
+    refinance_cpr: float = 0.10
+    max_cpr: float = 0.60
+
+
+@dataclass(frozen=True)
+class SimulationSpec:
+    """Everything that determines a simulation run."""
+
+    principal: float
+    years: int
+    terms: ArmTerms
+    rate_model: RateModel = field(default_factory=RateModel)
+    prepayment_model: PrepaymentModel = field(default_factory=PrepaymentModel)
+    paths: int = 10000
+    seed: int = 0
+
+    @property
+    def months(self) -> int:
+        return self.years * 12
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Per-path outcomes of a simulation run."""
+
+    total_interest: np.ndarray
+    payment_shock: np.ndarray
+    payoff_month: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_interest)
+
+    @classmethod
+    def concatenate(cls, results: Sequence["SimulationResult"]) -> "SimulationResult":
+        """Join the results of several blocks or chunks, in order."""
+        return cls(
+            total_interest=np.concatenate([result.total_interest for result in results]),
+            payment_shock=np.concatenate([result.payment_shock for result in results]),
+            payoff_month=np.concatenate([result.payoff_month for result in results]),
+        )
+
+    def percentiles(self, percentiles: Sequence[float] = SIMULATION_PERCENTILES) -> List[Dict[str, float]]:
+        """One row per percentile of total interest, payment shock and payoff month."""
+        columns = {
+            name: np.percentile(getattr(self, name), percentiles)
+            for name in ("total_interest", "payment_shock", "payoff_month")
+        }
+        return [
+            {"percentile": percentile, **{name: float(values[row]) for name, values in columns.items()}}
+            for row, percentile in enumerate(percentiles)
+        ]
+
+
+def simulate_index_paths(model: RateModel, rng: np.random.Generator, paths: int, months: int) -> np.ndarray:
+    """Monthly index levels along ``paths`` paths, using the exact monthly OU transition."""
+    decay = np.exp(-model.reversion / 12)
+    if model.reversion > 0:
+        step_std = model.volatility * np.sqrt((1 - decay ** 2) / (2 * model.reversion))
+    else:
+        step_std = model.volatility / np.sqrt(12)
+    shocks = rng.standard_normal((paths, months)) * step_std
+
+    index = np.empty((paths, months))
+    level = np.full(paths, float(model.start))
+    for month in range(months):
+        index[:, month] = level
+        level = model.mean + (level - model.mean) * decay + shocks[:, month]
+    return index
+
+
+def draw_block(spec: SimulationSpec, seed: np.random.SeedSequence, paths: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw the index paths and prepayment uniforms of one block from its own seed."""
+    rng = np.random.default_rng(seed)
+    index = simulate_index_paths(spec.rate_model, rng, paths, spec.months)
+    return index, rng.random((paths, spec.months))
+
+
+def simulate_paths(spec: SimulationSpec, index: np.ndarray, uniforms: np.ndarray) -> SimulationResult:
+    """Evaluate rate resets, payment re-amortization and prepayment for a batch of drawn paths."""
+    months = spec.months
+    schedules = arm_paths(spec.principal, spec.years, spec.terms, index)
+
+    # Monthly payoff probability from the annual prepayment rate and the refinance incentive
+    model = spec.prepayment_model
+    incentive = np.maximum(schedules.rates - (index + spec.terms.margin), 0.0)
+    cpr = np.minimum(model.base_cpr + model.refinance_cpr * incentive, model.max_cpr)
+    prepaid = uniforms < 1 - (1 - cpr) ** (1 / 12)
+
+    payoff_month = np.where(prepaid.any(axis=1), prepaid.argmax(axis=1) + 1, months)
+    active = np.arange(1, months + 1)[None, :] <= payoff_month[:, None]
+    return SimulationResult(
+        total_interest=np.where(active, schedules.interest, 0.0).sum(axis=1),
+        payment_shock=np.where(active, schedules.payments, 0.0).max(axis=1) / schedules.payments[:, 0],
+        payoff_month=payoff_month,
+    )
+
+
+def simulation_blocks(spec: SimulationSpec) -> List[Block]:
+    """Split the run into seeded blocks of at most ``SIMULATION_BLOCK_PATHS`` paths."""
+    counts = [SIMULATION_BLOCK_PATHS] * (spec.paths // SIMULATION_BLOCK_PATHS)
+    if spec.paths % SIMULATION_BLOCK_PATHS:
+        counts.append(spec.paths % SIMULATION_BLOCK_PATHS)
+    seeds = np.random.SeedSequence(spec.seed).spawn(len(counts))
+    return list(zip(seeds, counts))
+
+
+def simulation_chunks(spec: SimulationSpec, memory_budget: int = SIMULATION_MEMORY_BUDGET) -> Iterator[List[Block]]:
+    """Group blocks into chunks whose working arrays fit within ``memory_budget`` bytes.
+
+    A chunk is always at least one block, whatever the budget.
+    """
+    block_bytes = SIMULATION_BLOCK_PATHS * spec.months * 8 * _ARRAYS_PER_PATH_MONTH
+    blocks_per_chunk = max(1, memory_budget // block_bytes)
+    blocks = simulation_blocks(spec)
+    for start in range(0, len(blocks), blocks_per_chunk):
+        yield blocks[start:start + blocks_per_chunk]
+
+
+def simulate_chunk_job(spec: SimulationSpec, blocks: List[Block]) -> SimulationResult:
+    """Simulate a chunk of blocks as one batch; the unit of work sent to worker processes."""
+    draws = [draw_block(spec, seed, paths) for seed, paths in blocks]
+    index = np.concatenate([index for index, _ in draws])
+    uniforms = np.concatenate([uniforms for _, uniforms in draws])
+    del draws
+    return simulate_paths(spec, index, uniforms)
+
+
+def simulate_loan(spec: SimulationSpec, memory_budget: int = SIMULATION_MEMORY_BUDGET) -> SimulationResult:
+    """Run the whole simulation in this process, one chunk at a time."""
+    return SimulationResult.concatenate([
+        simulate_chunk_job(spec, blocks) for blocks in simulation_chunks(spec, memory_budget)
+    ])
@@ -0,0 +1,170 @@
+"""Shared result store backends and the compact binary encoding of results.
+
+The process-wide LRU caches in ``engine.cache`` sit in front of an optional
+shared backend speaking the Redis protocol, so several Reflex workers behind
+a load balancer compute each schedule once. Set ``REAL_ESTATE_CACHE_URL`` to
+``redis://host:port/db`` to enable it, or to ``memory://`` for the
+in-process stand-in used in development and tests.
+"""
+
+import logging
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from real_estate_reflex.engine.amortization import AmortizationSchedule, freeze
+
+logger = logging.getLogger(__name__)
+
+_SCHEDULE_HEADER = struct.Struct("<4sBIdd")
+_SCHEDULE_MAGIC = b"AMS1"
+_HAS_PAYMENTS = 0x01
+_SUMMARY = struct.Struct("<ddd")
+
+def loan_cache_key(kind: str, loan_key: Tuple[float, float, int], options: Optional[Mapping[str, object]] = None) -> str:
+    """Build the shared-store key for a result kind, normalized loan inputs and extra options."""
+    principal, annual_rate, years = loan_key
+    key = f"{kind}:{principal:.2f}:{annual_rate:.6f}:{years}"
+    if options:
+        key += ":" + ",".join(f"{name}={options[name]}" for name in sorted(options))
+    return key
+
+
+def encode_schedule(schedule: AmortizationSchedule) -> bytes:
+    """Encode a schedule as a fixed header followed by its raw float64 columns."""
+    flags = _HAS_PAYMENTS if schedule.payments is not None else 0
+    header = _SCHEDULE_HEADER.pack(
+        _SCHEDULE_MAGIC, flags, len(schedule), schedule.monthly_payment, schedule.total_interest
+    )
+    columns = [schedule.principal, schedule.interest, schedule.ending_balance]
+    if schedule.payments is not None:
+        columns.append(schedule.payments)
+    return header + b"".join(np.ascontiguousarray(column, dtype="<f8").tobytes() for column in columns)
+
+
+def decode_schedule(data: bytes) -> AmortizationSchedule:
+    """Decode a schedule written by ``encode_schedule``; the arrays come back read-only."""
+    magic, flags, months, monthly_payment, total_interest = _SCHEDULE_HEADER.unpack_from(data)
+    if magic != _SCHEDULE_MAGIC:
+        raise ValueError("Not an encoded amortization schedule")
+    column_count = 4 if flags & _HAS_PAYMENTS else 3
+    columns = np.frombuffer(data, dtype="<f8", count=column_count * months, offset=_SCHEDULE_HEADER.size)
+    # Zero-copy on little-endian hosts; the views share one read-only buffer
+    columns = columns.astype(float, copy=False).reshape(column_count, months)
+    freeze(columns)
+    return AmortizationSchedule(
+        principal=columns[0],
+        interest=columns[1],
+        ending_balance=columns[2],
+        monthly_payment=monthly_payment,
+        total_interest=total_interest,
+        payments=columns[3] if column_count == 4 else None,
+    )
+
+
+def encode_summary(summary: Tuple[float, float, float]) -> bytes:
+    """Encode a (monthly payment, total interest, total payment) triple."""
+    return _SUMMARY.pack(*summary)
+
+
+def decode_summary(data: bytes) -> Tuple[float, float, float]:
+    """Decode a summary written by ``encode_summary``."""
+    return _SUMMARY.unpack(data)
+
+
+class InMemoryRedis:
+    """Minimal in-process stand-in for a Redis client (get/set/mget/flushdb).
+
+    Expiry is accepted for API compatibility but not enforced.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data.get(name)
+
+    def mget(self, names: Iterable[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._data.get(name) for name in names]
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[name] = bytes(value)
+        return True
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+class RedisResultBackend:
+    """Shared result backend over any client with the Redis get/mget/set API.
+
+    Backend errors (``backend_errors``) are logged and treated as misses, so
+    an unavailable Redis degrades to computing locally rather than failing
+    the event.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "real_estate_reflex:v1:",
+        ttl_seconds: int = 24 * 60 * 60,
+        backend_errors: Tuple[type, ...] = (OSError,),
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.backend_errors = backend_errors
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for a key, or None."""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Return the stored bytes for several keys in one round trip."""
+        try:
+            values = self.client.mget([self.prefix + key for key in keys])
+        except self.backend_errors as error:
+            self.errors += 1
+            logger.warning("Result store read failed: %s", error)
+            values = [None] * len(keys)
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(keys) - found
+        return values
+
+    def set(self, key: str, value: bytes):
+        """Store bytes under a key with the backend TTL."""
+        try:
+            self.client.set(self.prefix + key, value, ex=self.ttl_seconds)
+        except self.backend_errors as error:
+            self.errors += 1
+            logger.warning("Result store write failed: %s", error)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/error counters."""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def backend_from_env() -> Optional[RedisResultBackend]:
+    """Create the shared backend named by ``REAL_ESTATE_CACHE_URL``, if any."""
+    url = os.environ.get("REAL_ESTATE_CACHE_URL", "")
+    if not url:
+        return None
+    if url == "memory://":
+        return RedisResultBackend(InMemoryRedis())
+    # Imported here so workers without a Redis URL never load the client
+    import redis
+
+    return RedisResultBackend(redis.Redis.from_url(url), backend_errors=(redis.RedisError, OSError))
@@ -0,0 +1,65 @@
+"""Server-side sorting, month-range filtering and paging over a schedule."""
+
+import re
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from real_estate_reflex.engine.amortization import SCHEDULE_COLUMNS, AmortizationSchedule
+
+_MONTH_RANGE = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+)\s*)?$")
+
+
+def parse_month_range(text: str, months: int) -> Optional[Tuple[int, int]]:
+    """Parse a filter such as ``"12"`` or ``"12-24"`` into a 1-based inclusive month range.
+
+    An empty filter selects every month. Returns None when the text is not a
+    month or month range.
+    """
+    if not text.strip():
+        return 1, months
+    match = _MONTH_RANGE.match(text)
+    if match is None:
+        return None
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    if first > last:
+        first, last = last, first
+    return max(first, 1), min(last, months)
+
+
+class ScheduleIndex:
+    """Sort orders for every schedule column, computed once per schedule."""
+
+    def __init__(self, schedule: AmortizationSchedule):
+        self.months = len(schedule)
+        identity = np.arange(self.months)
+        self._orders: Dict[str, np.ndarray] = {
+            # Month order is the identity and the payment column is constant
+            "month": identity,
+            "payment": identity,
+            "starting_balance": np.argsort(schedule.starting_balance, kind="stable"),
+            "principal": np.argsort(schedule.principal, kind="stable"),
+            "interest": np.argsort(schedule.interest, kind="stable"),
+            "ending_balance": np.argsort(schedule.ending_balance, kind="stable"),
+        }
+        for order in self._orders.values():
+            order.flags.writeable = False
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sort orders."""
+        return sum(order.nbytes for order in self._orders.values())
+
+    def select(self, sort_column: str, descending: bool, month_range: Optional[Tuple[int, int]]) -> np.ndarray:
+        """Return the 0-based row positions in display order for a sort and month range."""
+        if sort_column not in SCHEDULE_COLUMNS:
+            raise ValueError(f"Unknown schedule column: {sort_column}")
+        if month_range is None:
+            return np.empty(0, dtype=np.intp)
+
+        order = self._orders[sort_column]
+        first, last = month_range
+        if first > 1 or last < self.months:
+            order = order[(order >= first - 1) & (order <= last - 1)]
+        return order[::-1] if descending else order
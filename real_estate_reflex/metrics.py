@@ -0,0 +1,220 @@
+"""Hot-path instrumentation exposed as Prometheus text.
+
+Records event handler latency, serialized state delta size and schedule
+size in process-local histograms. Cache and result-store hit rates are read
+from their own counters when the endpoint is scraped.
+
+Latency and delta size are measured in Reflex middleware, which sees the
+updates an event handler returns or yields. Updates pushed from background
+tasks inside ``async with self`` (settled schedule refresh, simulation and
+portfolio progress) are emitted directly by the app and are not measured.
+Delta size is sampled (``REAL_ESTATE_DELTA_SAMPLE_RATE``, default 0.1)
+because measuring means serializing the delta a second time.
+
+Set ``REAL_ESTATE_METRICS=0`` to switch collection off. The middleware is
+then never installed and the observe helpers return at once, so handlers
+pay nothing. ``REAL_ESTATE_PROFILE_HANDLERS`` (a comma-separated list such
+as ``state.calculate_loan``) profiles a sampled fraction of those handlers'
+events with cProfile. ``REAL_ESTATE_PROFILE_RATE`` sets the fraction, and
+``.prof`` files are written to ``REAL_ESTATE_PROFILE_DIR``.
+"""
+
+import bisect
+import cProfile
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+from reflex.utils import format
+
+METRICS_ENABLED = os.environ.get("REAL_ESTATE_METRICS", "1").lower() not in ("0", "false", "off", "no")
+
+METRICS_ROUTE = "/metrics"
+
+PROFILE_HANDLERS = frozenset(
+    name.strip() for name in os.environ.get("REAL_ESTATE_PROFILE_HANDLERS", "").split(",") if name.strip()
+)
+PROFILE_RATE = float(os.environ.get("REAL_ESTATE_PROFILE_RATE", "0.01"))
+PROFILE_DIR = Path(os.environ.get("REAL_ESTATE_PROFILE_DIR", tempfile.gettempdir()))
+
+# Share of state deltas whose serialized size is measured
+DELTA_SAMPLE_RATE = float(os.environ.get("REAL_ESTATE_DELTA_SAMPLE_RATE", "0.1"))
+
+# A profile still running after this long lost its event (error or disconnect) and is discarded
+MAX_PROFILE_SECONDS = 60.0
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+MONTHS_BUCKETS = (12, 60, 120, 180, 240, 360, 480, 600)
+
+# Events still awaiting their final update; more than this means updates were lost, so start over
+MAX_EVENTS_IN_FLIGHT = 10000
+
+
+class Histogram:
+    """Thread-safe cumulative histogram keyed by one label, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], label: str = "handler"):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        # Per label value: bucket counts (plus +Inf), sum of observations
+        self._series: Dict[str, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        """Record one observation for a label value."""
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(label_value) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[position] += 1
+            self._series[label_value] = (counts, total + value)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        """Prometheus text lines for every label value."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {label_value: (list(counts), total) for label_value, (counts, total) in self._series.items()}
+        for label_value, (counts, total) in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:.10g}"
+                lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6g}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+handler_latency = Histogram(
+    "real_estate_handler_latency_seconds", "Time from receiving an event to its final state update.", LATENCY_BUCKETS
+)
+delta_bytes = Histogram(
+    "real_estate_state_delta_bytes", "Serialized size of a sample of the state deltas sent to the client.", BYTES_BUCKETS
+)
+schedule_months = Histogram(
+    "real_estate_schedule_months", "Months in each amortization schedule computed.", MONTHS_BUCKETS, label="kind"
+)
+schedule_bytes = Histogram(
+    "real_estate_schedule_bytes", "Memory held by each amortization schedule computed.", BYTES_BUCKETS, label="kind"
+)
+
+HISTOGRAMS = (handler_latency, delta_bytes, schedule_months, schedule_bytes)
+
+
+def observe_schedule(months: int, nbytes: int, kind: str = "fixed"):
+    """Record the size of a freshly computed schedule."""
+    if not METRICS_ENABLED:
+        return
+    schedule_months.observe(kind, months)
+    schedule_bytes.observe(kind, nbytes)
+
+
+def handler_label(event_name: str) -> str:
+    """Short ``state.handler`` label for a full event name, e.g. ``schedule_state.sort_table``."""
+    state_name, _, handler = event_name.rpartition(".")
+    return f"{state_name.rpartition('____')[2]}.{handler}"
+
+
+class MetricsMiddleware(Middleware):
+    """Times every event from preprocess to its final update and measures a sample of the deltas sent.
+
+    Only updates that pass through middleware are seen; see the module
+    docstring for the background-task limitation.
+    """
+
+    def __init__(self):
+        self._started: Dict[int, Tuple[float, Optional[cProfile.Profile]]] = {}
+        # The one running profiler and when it started
+        self._profiler: Optional[cProfile.Profile] = None
+        self._profile_started = 0.0
+
+    async def preprocess(self, app, state: BaseState, event: Event) -> Optional[StateUpdate]:
+        now = time.perf_counter()
+        if self._profiler is not None and now - self._profile_started > MAX_PROFILE_SECONDS:
+            self._discard_profile()
+        profiler = None
+        if (
+            PROFILE_HANDLERS
+            and self._profiler is None
+            and handler_label(event.name) in PROFILE_HANDLERS
+            and random.random() < PROFILE_RATE
+        ):
+            # One profile at a time: cProfile hooks the whole interpreter
+            profiler = self._profiler = cProfile.Profile()
+            self._profile_started = now
+            profiler.enable()
+        if len(self._started) > MAX_EVENTS_IN_FLIGHT:
+            self._started.clear()
+            if self._profiler is not None and self._profiler is not profiler:
+                self._discard_profile()
+        self._started[id(event)] = (now, profiler)
+        return None
+
+    async def postprocess(self, app, state: BaseState, event: Event, update: StateUpdate) -> StateUpdate:
+        label = handler_label(event.name)
+        if update.delta and random.random() < DELTA_SAMPLE_RATE:
+            delta_bytes.observe(label, len(format.json_dumps(update.delta)))
+        if update.final:
+            started = self._started.pop(id(event), None)
+            if started is not None:
+                start, profiler = started
+                handler_latency.observe(label, time.perf_counter() - start)
+                if profiler is not None and profiler is self._profiler:
+                    self._finish_profile(label)
+        return update
+
+    def _finish_profile(self, label: str):
+        profiler = self._profiler
+        self._discard_profile()
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(PROFILE_DIR / f"{label}-{time.time_ns()}.prof")
+
+    def _discard_profile(self):
+        """Stop the running profiler so another event can be profiled."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format."""
+    from real_estate_reflex.engine import cache
+
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+
+    cache_stats = {name: lru.stats() for name, lru in cache.CACHES.items()}
+    for stat, kind, documentation in (
+        ("hits", "counter", "Lookups served from the in-process cache."),
+        ("misses", "counter", "Lookups that had to compute or fetch a result."),
+        ("evictions", "counter", "Entries evicted to stay within the cache bounds."),
+        ("entries", "gauge", "Entries currently held."),
+        ("bytes", "gauge", "Approximate memory currently held."),
+        ("hit_rate", "gauge", "Share of lookups served from the cache."),
+    ):
+        name = f"real_estate_cache_{stat}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f'{name}{{cache="{cache_name}"}} {stats[stat]:g}' for cache_name, stats in cache_stats.items())
+
+    if cache.shared_backend is not None:
+        for stat, value in cache.shared_backend.stats().items():
+            name = f"real_estate_result_store_{stat}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
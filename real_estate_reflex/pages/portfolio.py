@@ -0,0 +1,16 @@
+"""Portfolio import page for the Real Estate Loan Calculator."""
+
+import reflex as rx
+from real_estate_reflex.components.layout import page_layout
+from real_estate_reflex.components.portfolio import portfolio_upload
+
+def portfolio() -> rx.Component:
+    """The portfolio import page."""
+    return page_layout(
+        "Portfolio Amortization",
+        "Amortize a whole loan book and see portfolio totals and balance runoff.",
+        rx.box(
+            portfolio_upload(),
+            width="100%",
+        ),
+    )
@@ -2,13 +2,133 @@
 
 import reflex as rx
 import numpy as np
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
-from typing import List, Dict, Any
+import asyncio
+import math
+from pathlib import Path
+from typing import List, Dict, Any, ClassVar, Optional, Tuple
+from urllib.parse import urlencode
 
-from rxconfig import config
+from reflex.components.core.upload import uploaded_files_url_prefix
+from real_estate_reflex.api import CSV_DOWNLOAD_ROUTE, api
+from real_estate_reflex.components.figures import (
+    affordability_figure,
+    balance_figure,
+    empty_figure,
+    interest_principal_figure,
+    principal_interest_figure,
+    scenario_overlay_figure,
+    sensitivity_heatmap_figure,
+)
+from real_estate_reflex.engine.affordability import (
+    AFFORDABILITY_QUERIES,
+    affordability_curve,
+    max_principal,
+    max_rate,
+    min_term_months,
+)
+from real_estate_reflex.engine.amortization import SCHEDULE_COLUMNS
+from real_estate_reflex.engine.arm import ArmTerms, arm_paths
+from real_estate_reflex.engine.cache import (
+    LoanKey,
+    PrepaymentKey,
+    cached_chart_series,
+    cached_loan_summaries,
+    cached_loan_summary,
+    cached_monthly_payment,
+    cached_prepayment_schedule,
+    cached_schedule,
+    cached_schedule_index,
+    cached_sensitivity_grid,
+    normalize_loan_key,
+    prepayment_cache_key,
+)
+from real_estate_reflex.engine.charts import OverlaySeries, Series, scenario_overlay_series
+from real_estate_reflex.engine.jobs import amortize_portfolio_in_pool, process_pool_lifespan, simulate_loan_in_pool
+from real_estate_reflex.engine.portfolio import count_loan_rows, write_runoff
+from real_estate_reflex.engine.prepayment import Prepayment, parse_lump_sums
+from real_estate_reflex.engine.sensitivity import SENSITIVITY_METRICS
+from real_estate_reflex.engine.simulation import RateModel, SimulationResult, SimulationSpec
+from real_estate_reflex.engine.table import parse_month_range
+from real_estate_reflex.metrics import METRICS_ENABLED, MetricsMiddleware
+
+# Seconds of input quiet before the full schedule is rebuilt in live-update mode
+SCHEDULE_SETTLE_SECONDS = 0.8
+
+# Most scenarios a session can compare at once
+MAX_SCENARIOS = 36
+
+# Most Monte Carlo paths a session can request
+MAX_SIMULATION_PATHS = 100000
+
+# Payment budgets evaluated for the affordability curve
+AFFORDABILITY_POINTS = 200
+
+# Comparison table columns the scenarios can be ranked by
+SCENARIO_RANK_COLUMNS = ("total_interest", "total_payment", "monthly_payment")
+
+
+def parse_number(value: Any, whole: bool = False) -> Optional[float]:
+    """Parse an input field as a finite number (a whole number if ``whole``), or None if it is not one."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number) or (whole and not number.is_integer()):
+        return None
+    return number
+
+
+def assign_number(state: rx.State, field: str, value: Any):
+    """Set a numeric field from an input field, keeping its int or float type; input that is not a number is ignored."""
+    whole = isinstance(getattr(state, field), int)
+    number = parse_number(value, whole=whole)
+    if number is not None:
+        setattr(state, field, int(number) if whole else number)
+
+
+def backend_url(path: str) -> rx.Var:
+    """Absolute URL of a backend route, resolved in the browser the way ``rx.get_upload_url`` is.
+    
+    ``rx.download`` only takes relative URLs as strings, and those resolve
+    against the frontend origin; the backend origin is only known on the
+    client, from ``getBackendURL(env.UPLOAD)``.
+    """
+    return rx.Var(
+        _js_expr=f"new URL({rx.Var.create(path)!s}, {uploaded_files_url_prefix!s}).href",
+        _var_data=uploaded_files_url_prefix._get_all_var_data(),
+    ).to(str)
+
+
+def scenario_name(serial: int) -> str:
+    """Name the n-th scenario Scenario A, B, ... Z, then Scenario 27, 28, ..."""
+    return f"Scenario {chr(ord('A') + serial) if serial < 26 else serial + 1}"
+
+
+def new_scenario(serial: int, loan_amount: float, interest_rate: float, term_years: int) -> Dict[str, Any]:
+    """Input fields of one comparison scenario."""
+    return {
+        "name": scenario_name(serial),
+        "loan_amount": loan_amount,
+        "interest_rate": interest_rate,
+        "term_years": term_years,
+    }
+
+
+class TransientVarsMixin:
+    """Leaves the cached computed vars named in ``_transient_vars`` out of the persisted state.
+    
+    Figures are large and rebuild on demand from the result caches, so they
+    are not worth pickling into the state manager.
+    """
+    
+    _transient_vars: ClassVar[Tuple[str, ...]] = ()
+    
+    def __getstate__(self):
+        state = super().__getstate__()
+        for var_name in self._transient_vars:
+            state["__dict__"].pop(f"__cached_{var_name}", None)
+        return state
 
 
 class State(rx.State):
@@ -20,160 +140,786 @@ class State(rx.State):
     loan_term_years: int = 30
     desired_monthly_payment: float = 0.0
     
+    # Live recalculation on input change (FR-001.4)
+    live_update: bool = True
+    _input_generation: int = 0
+    
     # Calculation results
     monthly_payment: float = 0.0
     total_interest: float = 0.0
     total_payment: float = 0.0
-    amortization_table: List[Dict[str, Any]] = []
+    schedule_months: int = 0
+    
+    # Key of the current inputs into the server-side result store (engine.cache).
+    # Schedules, sort indexes and chart series are looked up by this key and
+    # never stored in session state.
+    _schedule_key: Optional[LoanKey] = None
     
-    # For scenario comparison
+    # For scenario comparison (scenarios and results live in ComparisonState)
     show_comparison: bool = False
-    scenario_a_loan_amount: float = 250000.0
-    scenario_a_interest_rate: float = 5.0
-    scenario_a_term_years: int = 30
-    scenario_b_loan_amount: float = 250000.0
-    scenario_b_interest_rate: float = 5.5
-    scenario_b_term_years: int = 15
-    scenario_a_monthly: float = 0.0
-    scenario_a_total_interest: float = 0.0
-    scenario_b_monthly: float = 0.0
-    scenario_b_total_interest: float = 0.0
     
     # Affordability estimator result
     affordable_loan_amount: float = 0.0
     
     def calculate_monthly_payment(self, principal: float, annual_rate: float, years: int) -> float:
         """Calculate the monthly payment for a loan."""
-        if annual_rate == 0:
-            return principal / (years * 12)
-            
-        monthly_rate = annual_rate / 100 / 12
-        num_payments = years * 12
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate) ** num_payments) / ((1 + monthly_rate) ** num_payments - 1)
-        return monthly_payment
+        return cached_monthly_payment(principal, annual_rate, years)
     
     def calculate_loan(self):
-        """Calculate loan details and generate amortization table."""
-        self.monthly_payment = self.calculate_monthly_payment(
+        """Calculate the loan summary; the schedule, table and charts are built on demand."""
+        if not self._inputs_valid():
+            return
+        self._recalculate_summary()
+        self._invalidate_schedule()
+    
+    def _inputs_valid(self) -> bool:
+        """Whether the loan inputs describe a loan that can be calculated."""
+        return self.loan_amount > 0 and self.annual_interest_rate >= 0 and 1 <= self.loan_term_years <= 50
+    
+    def _recalculate_summary(self):
+        """Recompute the summary card figures in O(1) from the annuity formula."""
+        self.monthly_payment, total_interest, total_payment = cached_loan_summary(
             self.loan_amount, self.annual_interest_rate, self.loan_term_years
         )
-        
-        # Generate amortization table
-        monthly_rate = self.annual_interest_rate / 100 / 12
-        amortization_data = []
-        remaining_balance = self.loan_amount
-        total_interest = 0
-        
-        for month in range(1, self.loan_term_years * 12 + 1):
-            interest_payment = remaining_balance * monthly_rate
-            principal_payment = self.monthly_payment - interest_payment
-            total_interest += interest_payment
-            remaining_balance -= principal_payment
-            
-            # Handle final payment rounding issues
-            if month == self.loan_term_years * 12:
-                principal_payment += remaining_balance
-                remaining_balance = 0
-            
-            amortization_data.append({
-                "month": month,
-                "starting_balance": round(remaining_balance + principal_payment, 2),
-                "payment": round(self.monthly_payment, 2),
-                "principal": round(principal_payment, 2),
-                "interest": round(interest_payment, 2),
-                "ending_balance": round(remaining_balance, 2)
-            })
-        
-        self.amortization_table = amortization_data
         self.total_interest = round(total_interest, 2)
-        self.total_payment = round(self.loan_amount + total_interest, 2)
+        self.total_payment = round(total_payment, 2)
+    
+    def _invalidate_schedule(self):
+        """Point the result-store key at the current inputs; views rebuild from it on demand."""
+        schedule_key = normalize_loan_key(
+            self.loan_amount, self.annual_interest_rate, self.loan_term_years
+        )
+        self.schedule_months = self.loan_term_years * 12
+        # Only a change of inputs should invalidate the cached chart vars
+        if schedule_key == self._schedule_key:
+            return
+        self._schedule_key = schedule_key
+    
+    def _input_changed(self):
+        """Refresh the summary now and invalidate the schedule lazily once input settles."""
+        if not self.live_update or not self._inputs_valid():
+            return
+        self._input_generation += 1
+        self._recalculate_summary()
+        return State.refresh_schedule_when_settled
+    
+    def update_loan_amount(self, value: str):
+        """Set the loan amount from the input field; partial or non-finite input is ignored."""
+        number = parse_number(value)
+        if number is None:
+            return
+        self.loan_amount = number
+        return self._input_changed()
+    
+    def update_annual_interest_rate(self, value: str):
+        """Set the annual interest rate from the input field; partial or non-finite input is ignored."""
+        number = parse_number(value)
+        if number is None:
+            return
+        self.annual_interest_rate = number
+        return self._input_changed()
+    
+    def update_loan_term_years(self, value: str):
+        """Set the loan term from the input field; only whole numbers of years are accepted."""
+        number = parse_number(value, whole=True)
+        if number is None:
+            return
+        self.loan_term_years = int(number)
+        return self._input_changed()
+    
+    def update_desired_monthly_payment(self, value: str):
+        """Set the desired monthly payment from the input field; partial or non-finite input is ignored."""
+        assign_number(self, "desired_monthly_payment", value)
+    
+    @rx.event(background=True)
+    async def refresh_schedule_when_settled(self):
+        """Point the schedule and charts at the new inputs once no further input has arrived for a short while."""
+        async with self:
+            generation = self._input_generation
+        await asyncio.sleep(SCHEDULE_SETTLE_SECONDS)
+        async with self:
+            # A newer input event superseded this one; its own refresh will run instead
+            if generation == self._input_generation and self._inputs_valid():
+                self._invalidate_schedule()
     
     def calculate_affordable_loan(self):
         """Calculate the affordable loan amount based on desired monthly payment."""
         if self.desired_monthly_payment <= 0:
             self.affordable_loan_amount = 0
             return
-            
-        monthly_rate = self.annual_interest_rate / 100 / 12
-        num_payments = self.loan_term_years * 12
         
-        if monthly_rate == 0:
-            self.affordable_loan_amount = self.desired_monthly_payment * num_payments
+        affordable = max_principal(self.desired_monthly_payment, self.annual_interest_rate, self.loan_term_years)
+        self.affordable_loan_amount = round(float(affordable), 2)
+    
+    # Event handlers for toggling comparison view and CSV download
+    def toggle_comparison(self):
+        """Toggle the loan comparison view."""
+        self.show_comparison = not self.show_comparison
+        
+    def download_csv(self):
+        """Download the amortization table as CSV from the streaming export endpoint."""
+        if self._schedule_key is None:
             return
             
-        # Formula for loan amount based on payment
-        self.affordable_loan_amount = self.desired_monthly_payment * ((1 - (1 + monthly_rate) ** -num_payments) / monthly_rate)
-        self.affordable_loan_amount = round(self.affordable_loan_amount, 2)
+        principal, rate, years = self._schedule_key
+        query = urlencode({"principal": principal, "rate": rate, "years": years})
+        # The export route is served by the backend, not the frontend origin the page runs on
+        return rx.download(url=backend_url(f"{CSV_DOWNLOAD_ROUTE}?{query}"), filename="amortization_schedule.csv")
+
+
+class ScheduleState(TransientVarsMixin, State):
+    """Amortization table and chart views, kept out of the root state.
     
-    def compare_scenarios(self):
-        """Compare two different loan scenarios."""
-        self.scenario_a_monthly = self.calculate_monthly_payment(
-            self.scenario_a_loan_amount, self.scenario_a_interest_rate, self.scenario_a_term_years
+    Only the visible table page is held here; the schedule itself is read from
+    the server-side result store by the parent's _schedule_key.
+    """
+    
+    # Visible window of the amortization schedule (only these rows are sent to the client)
+    amortization_table: List[Dict[str, Any]] = []
+    table_page: int = 0
+    table_page_size: int = 10
+    table_page_count: int = 0
+    table_row_count: int = 0
+    table_sort_column: str = "month"
+    table_sort_descending: bool = False
+    table_filter: str = ""
+    
+    # Whether a chart has been shown, so chart series are only derived once needed
+    charts_visible: bool = False
+    
+    # Key of the schedule the table window was built from
+    _table_key: Optional[LoanKey] = None
+    
+    _transient_vars: ClassVar[Tuple[str, ...]] = ("principal_interest_chart", "balance_chart", "interest_principal_chart")
+    
+    def load_schedule(self):
+        """Build the visible table rows for the current inputs if they changed."""
+        if self._table_key != self._schedule_key:
+            self.table_page = 0
+            self._refresh_table()
+    
+    def _refresh_table(self):
+        """Apply sort, filter and paging using the cached schedule index, and materialize the page."""
+        self._table_key = self._schedule_key
+        if self._schedule_key is None:
+            self.amortization_table = []
+            self.table_row_count = self.table_page_count = self.table_page = 0
+            return
+        schedule_index = cached_schedule_index(*self._schedule_key)
+        rows = schedule_index.select(
+            self.table_sort_column,
+            self.table_sort_descending,
+            parse_month_range(self.table_filter, schedule_index.months),
         )
-        
-        self.scenario_b_monthly = self.calculate_monthly_payment(
-            self.scenario_b_loan_amount, self.scenario_b_interest_rate, self.scenario_b_term_years
+        self.table_row_count = len(rows)
+        self.table_page_count = -(-self.table_row_count // self.table_page_size)
+        self.table_page = max(0, min(self.table_page, self.table_page_count - 1))
+        start = self.table_page * self.table_page_size
+        self.amortization_table = cached_schedule(*self._schedule_key).rows_at(
+            rows[start:start + self.table_page_size]
         )
-        
-        # Calculate total interest for each scenario
-        scenario_a_total = self.scenario_a_monthly * self.scenario_a_term_years * 12
-        scenario_a_interest = scenario_a_total - self.scenario_a_loan_amount
-        self.scenario_a_total_interest = round(scenario_a_interest, 2)
-        
-        scenario_b_total = self.scenario_b_monthly * self.scenario_b_term_years * 12
-        scenario_b_interest = scenario_b_total - self.scenario_b_loan_amount
-        self.scenario_b_total_interest = round(scenario_b_interest, 2)
+    
+    def next_table_page(self):
+        """Show the next page of the amortization table."""
+        if self.table_page + 1 < self.table_page_count:
+            self.table_page += 1
+            self._refresh_table()
+    
+    def prev_table_page(self):
+        """Show the previous page of the amortization table."""
+        if self.table_page > 0:
+            self.table_page -= 1
+            self._refresh_table()
+    
+    def sort_table(self, column: str):
+        """Sort the amortization table by a column, toggling direction on repeat clicks."""
+        if column not in SCHEDULE_COLUMNS:
+            return
+        if column == self.table_sort_column:
+            self.table_sort_descending = not self.table_sort_descending
+        else:
+            self.table_sort_column = column
+            self.table_sort_descending = False
+        self.table_page = 0
+        self._refresh_table()
+    
+    def set_table_filter(self, value: str):
+        """Filter the amortization table to a month or month range such as 12-24."""
+        self.table_filter = value
+        self.table_page = 0
+        self._refresh_table()
+    
+    def show_charts(self):
+        """Start deriving chart series; called when a chart is first mounted."""
+        self.charts_visible = True
+    
+    def _chart_series(self) -> Dict[str, Series]:
+        """Downsampled chart series for the current schedule, shared through the process-wide cache."""
+        if self._schedule_key is None or not self.charts_visible:
+            return {}
+        return cached_chart_series(*self._schedule_key)
+    
+    @rx.var(cache=True)
+    def principal_interest_chart(self) -> go.Figure:
+        """Principal vs interest figure, rebuilt only when the loan inputs change."""
+        series = self._chart_series()
+        return principal_interest_figure(series) if series else empty_figure()
+    
+    @rx.var(cache=True)
+    def balance_chart(self) -> go.Figure:
+        """Remaining balance figure, rebuilt only when the loan inputs change."""
+        series = self._chart_series()
+        return balance_figure(series) if series else empty_figure()
+    
+    @rx.var(cache=True)
+    def interest_principal_chart(self) -> go.Figure:
+        """Principal to interest donut, rebuilt only when the loan totals change."""
+        if self.total_interest <= 0 or not self.charts_visible:
+            return empty_figure()
+        return interest_principal_figure(self.loan_amount, self.total_interest)
     
     def generate_principal_interest_chart_data(self):
         """Generate data for the principal vs interest chart."""
-        data = []
-        for month, row in enumerate(self.amortization_table):
-            data.append({
-                "month": month + 1,
-                "principal": row["principal"],
-                "interest": row["interest"]
-            })
-        return data
+        series = self._chart_series()
+        if not series:
+            return []
+        (months, principal), (_, interest) = series["principal"], series["interest"]
+        return [
+            {"month": month, "principal": principal_value, "interest": interest_value}
+            for month, principal_value, interest_value in zip(months, principal, interest)
+        ]
     
     def generate_balance_chart_data(self):
         """Generate data for the remaining balance chart."""
-        return [{
-            "month": row["month"],
-            "balance": row["ending_balance"]
-        } for row in self.amortization_table]
+        series = self._chart_series()
+        if not series:
+            return []
+        months, balance = series["balance"]
+        return [{"month": month, "balance": value} for month, value in zip(months, balance)]
+
+
+class ComparisonState(TransientVarsMixin, State):
+    """N-way scenario comparison, kept out of the root state.
     
-    # Event handlers for toggling comparison view and CSV download
-    def toggle_comparison(self):
-        """Toggle the loan comparison view."""
-        self.show_comparison = not self.show_comparison
+    Every scenario is evaluated in one batched pass; overlay charts share one
+    downsampled month axis so their size stays bounded as scenarios are added.
+    """
+    
+    scenarios: List[Dict[str, Any]] = [
+        new_scenario(0, 250000.0, 5.0, 30),
+        new_scenario(1, 250000.0, 5.5, 15),
+    ]
+    scenario_rank_by: str = "total_interest"
+    
+    # Ranked results of the last comparison, one row per valid scenario
+    scenario_results: List[Dict[str, Any]] = []
+    
+    # Serial number of the next scenario, so names stay unique after removals
+    _scenario_serial: int = 2
+    
+    # Rate x term sensitivity heatmap for the loan amount taken when it was shown,
+    # so typing on the home page never rebuilds it
+    sensitivity_metric: str = "monthly_payment"
+    sensitivity_visible: bool = False
+    sensitivity_loan_amount: float = 0.0
+    
+    _transient_vars: ClassVar[Tuple[str, ...]] = (
+        "scenario_balance_chart", "scenario_interest_chart", "sensitivity_heatmap"
+    )
+    
+    def add_scenario(self):
+        """Add a scenario, starting from a copy of the last one."""
+        if len(self.scenarios) >= MAX_SCENARIOS:
+            return
+        last = self.scenarios[-1] if self.scenarios else new_scenario(
+            0, self.loan_amount, self.annual_interest_rate, self.loan_term_years
+        )
+        self.scenarios.append(
+            new_scenario(self._scenario_serial, last["loan_amount"], last["interest_rate"], last["term_years"])
+        )
+        self._scenario_serial += 1
+    
+    def remove_scenario(self, index: int):
+        """Remove a scenario from the comparison."""
+        if 0 <= index < len(self.scenarios):
+            self.scenarios.pop(index)
+    
+    def update_scenario(self, index: int, field: str, value: str):
+        """Set one input field of a scenario from its input."""
+        if not 0 <= index < len(self.scenarios) or field not in ("loan_amount", "interest_rate", "term_years"):
+            return
+        number = parse_number(value, whole=field == "term_years")
+        if number is None:
+            return
+        self.scenarios[index][field] = int(number) if field == "term_years" else number
+    
+    def compare_scenarios(self):
+        """Compare every valid scenario in one batched pass and rank the results."""
+        valid = [
+            scenario for scenario in self.scenarios
+            if scenario["loan_amount"] > 0 and scenario["interest_rate"] >= 0 and 1 <= scenario["term_years"] <= 50
+        ]
+        summaries = cached_loan_summaries(
+            [scenario["loan_amount"] for scenario in valid],
+            [scenario["interest_rate"] for scenario in valid],
+            [scenario["term_years"] for scenario in valid],
+        )
+        self.scenario_results = self._ranked([
+            {
+                **scenario,
+                "monthly_payment": round(monthly_payment, 2),
+                "total_interest": round(total_interest, 2),
+                "total_payment": round(total_payment, 2),
+            }
+            for scenario, (monthly_payment, total_interest, total_payment) in zip(valid, summaries)
+        ])
+    
+    def rank_scenarios(self, column: str):
+        """Re-rank the comparison table by total interest, total payment or monthly payment."""
+        if column not in SCENARIO_RANK_COLUMNS:
+            return
+        self.scenario_rank_by = column
+        self.scenario_results = self._ranked(self.scenario_results)
+    
+    def _ranked(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort results ascending by the rank column and number them from 1."""
+        ordered = sorted(results, key=lambda result: result[self.scenario_rank_by])
+        return [{**result, "rank": rank} for rank, result in enumerate(ordered, start=1)]
+    
+    def _overlay_series(self) -> Dict[str, OverlaySeries]:
+        """Balance and interest curves of the compared scenarios on a shared month axis."""
+        if not self.scenario_results:
+            return {}
+        return scenario_overlay_series(
+            [result["loan_amount"] for result in self.scenario_results],
+            [result["interest_rate"] for result in self.scenario_results],
+            [result["term_years"] for result in self.scenario_results],
+        )
+    
+    @rx.var(cache=True)
+    def scenario_balance_chart(self) -> go.Figure:
+        """Remaining balance of every compared scenario, rebuilt only when the results change."""
+        overlay = self._overlay_series()
+        if not overlay:
+            return empty_figure()
+        names = [result["name"] for result in self.scenario_results]
+        return scenario_overlay_figure(names, overlay["balance"], "Remaining Balance ($)")
+    
+    @rx.var(cache=True)
+    def scenario_interest_chart(self) -> go.Figure:
+        """Monthly interest of every compared scenario, rebuilt only when the results change."""
+        overlay = self._overlay_series()
+        if not overlay:
+            return empty_figure()
+        names = [result["name"] for result in self.scenario_results]
+        return scenario_overlay_figure(names, overlay["interest"], "Monthly Interest ($)")
+    
+    def show_sensitivity(self):
+        """Build the sensitivity heatmap for the current loan amount; called when it is mounted."""
+        self.sensitivity_visible = True
+        self.sensitivity_loan_amount = self.loan_amount
+    
+    def set_sensitivity_metric(self, metric: str):
+        """Switch the heatmap between monthly payment and total interest."""
+        if metric in SENSITIVITY_METRICS:
+            self.sensitivity_metric = metric
+    
+    @rx.var(cache=True)
+    def sensitivity_heatmap(self) -> go.Figure:
+        """Rate x term heatmap for the loan amount taken by show_sensitivity, rebuilt only when it or the metric changes."""
+        if not self.sensitivity_visible or self.sensitivity_loan_amount <= 0:
+            return empty_figure()
+        return sensitivity_heatmap_figure(
+            cached_sensitivity_grid(self.sensitivity_loan_amount), self.sensitivity_metric
+        )
+
+
+class AffordabilityState(TransientVarsMixin, State):
+    """Inverse loan queries for the desired payment and the affordability curve around it."""
+    
+    # Highest rate the desired payment covers for the current amount and term (-1 if none)
+    affordable_max_rate: float = 0.0
+    # Fewest months the desired payment needs for the current amount and rate (0 if never)
+    affordable_min_term_months: int = 0
+    
+    affordability_query: str = "max_principal"
+    affordability_visible: bool = False
+    # (reference payment, amount, rate, years) the curve was last built for; taken by
+    # show_affordability and solve_affordability so input keystrokes never rebuild it
+    affordability_inputs: List[float] = []
+    
+    _transient_vars: ClassVar[Tuple[str, ...]] = ("affordability_chart",)
+    
+    def solve_affordability(self):
+        """Answer the amount, rate and term questions for the desired monthly payment."""
+        self.calculate_affordable_loan()
+        self._take_affordability_inputs()
+        if self.desired_monthly_payment <= 0 or not self._inputs_valid():
+            self.affordable_max_rate = 0.0
+            self.affordable_min_term_months = 0
+            return
+        rate = float(max_rate(self.loan_amount, self.desired_monthly_payment, self.loan_term_years))
+        months = float(min_term_months(self.loan_amount, self.annual_interest_rate, self.desired_monthly_payment))
+        self.affordable_max_rate = round(rate, 3) if np.isfinite(rate) else -1.0
+        self.affordable_min_term_months = int(months) if np.isfinite(months) else 0
+    
+    def show_affordability(self):
+        """Build the affordability curve for the current inputs; called when it is mounted."""
+        self.affordability_visible = True
+        self._take_affordability_inputs()
+    
+    def _take_affordability_inputs(self):
+        """Store the inputs the curve is drawn for, or clear them when they are invalid."""
+        if not self._inputs_valid():
+            self.affordability_inputs = []
+            return
+        reference = self.desired_monthly_payment
+        if reference <= 0:
+            reference = cached_monthly_payment(self.loan_amount, self.annual_interest_rate, self.loan_term_years)
+        self.affordability_inputs = [reference, self.loan_amount, self.annual_interest_rate, self.loan_term_years]
+    
+    def set_affordability_query(self, query: str):
+        """Switch the curve between maximum amount, maximum rate and minimum term."""
+        if query in AFFORDABILITY_QUERIES:
+            self.affordability_query = query
+    
+    @rx.var(cache=True)
+    def affordability_chart(self) -> go.Figure:
+        """Answer the selected query for budgets from a quarter to twice the desired (or current) payment."""
+        if not self.affordability_visible or not self.affordability_inputs:
+            return empty_figure()
+        reference, principal, rate, years = self.affordability_inputs
+        budgets = np.linspace(reference / 4, reference * 2, AFFORDABILITY_POINTS)
+        values = affordability_curve(self.affordability_query, budgets, principal, rate, int(years))
+        return affordability_figure(budgets, values, self.affordability_query)
+
+
+class PrepaymentState(State):
+    """Extra principal payments for the current loan and what they save."""
+    
+    # Prepayment inputs
+    extra_monthly_payment: float = 0.0
+    extra_yearly_payment: float = 0.0
+    lump_sums: str = ""
+    prepayment_error: str = ""
+    
+    # Prepayment results
+    prepayment_payoff_month: int = 0
+    prepayment_total_interest: float = 0.0
+    prepayment_interest_saved: float = 0.0
+    prepayment_months_saved: int = 0
+    
+    # Cache key of the last result, so a change recomputes only the months after it
+    _prepayment_key: Optional[PrepaymentKey] = None
+    
+    _number_inputs: ClassVar[Tuple[str, ...]] = ("extra_monthly_payment", "extra_yearly_payment")
+    
+    def update_input(self, field: str, value: str):
+        """Set one extra payment amount from its input field; partial or non-finite input is ignored."""
+        if field in self._number_inputs:
+            assign_number(self, field, value)
+    
+    def calculate_prepayments(self):
+        """Amortize the current loan with the extra payments and report the interest and months saved."""
+        lump_sums = parse_lump_sums(self.lump_sums)
+        if lump_sums is None or self.extra_monthly_payment < 0 or self.extra_yearly_payment < 0:
+            self.prepayment_error = "Extra payments cannot be negative; enter lump sums as month:amount, e.g. 60:10000."
+            return
+        if not self._inputs_valid():
+            return
+        self.prepayment_error = ""
         
-    def download_csv(self):
-        """Convert amortization table to CSV and provide download."""
-        if not self.amortization_table:
+        prepayments = [
+            Prepayment(amount=self.extra_monthly_payment, month=1, every=1),
+            Prepayment(amount=self.extra_yearly_payment, month=12, every=12),
+            *lump_sums,
+        ]
+        loan = (self.loan_amount, self.annual_interest_rate, self.loan_term_years)
+        prepayments = [prepayment for prepayment in prepayments if prepayment.amount > 0]
+        result = cached_prepayment_schedule(*loan, prepayments, previous_key=self._prepayment_key)
+        self._prepayment_key = prepayment_cache_key(*loan, prepayments)
+        self.prepayment_payoff_month = result.payoff_month
+        self.prepayment_total_interest = round(result.schedule.total_interest, 2)
+        self.prepayment_interest_saved = round(result.interest_saved, 2)
+        self.prepayment_months_saved = result.months_saved
+
+
+class ArmState(State):
+    """Adjustable-rate version of the current loan along an assumed index path."""
+    
+    # ARM terms, in annual percent
+    arm_initial_rate: float = 4.5
+    arm_fixed_years: int = 5
+    arm_margin: float = 2.75
+    arm_initial_cap: float = 2.0
+    arm_periodic_cap: float = 2.0
+    arm_lifetime_cap: float = 5.0
+    
+    # Assumed index path: today's level plus a constant yearly change
+    arm_index_rate: float = 3.0
+    arm_index_change: float = 0.25
+    
+    # ARM results
+    arm_initial_payment: float = 0.0
+    arm_max_payment: float = 0.0
+    arm_total_interest: float = 0.0
+    arm_resets: List[Dict[str, Any]] = []
+    
+    _number_inputs: ClassVar[Tuple[str, ...]] = (
+        "arm_initial_rate",
+        "arm_fixed_years",
+        "arm_margin",
+        "arm_initial_cap",
+        "arm_periodic_cap",
+        "arm_lifetime_cap",
+        "arm_index_rate",
+        "arm_index_change",
+    )
+    
+    def update_input(self, field: str, value: str):
+        """Set one ARM term or index assumption from its input field; partial or non-finite input is ignored."""
+        if field in self._number_inputs:
+            assign_number(self, field, value)
+    
+    def calculate_arm(self):
+        """Amortize the current loan amount and term as an ARM, re-amortizing at every reset.
+        
+        Zero fixed years sets the rate from the index from the first month.
+        """
+        if not self._inputs_valid() or self.arm_initial_rate < 0 or self.arm_fixed_years < 0:
             return
-            
-        # Create a DataFrame from the amortization table
-        df = pd.DataFrame(self.amortization_table)
-        csv_string = df.to_csv(index=False)
+        terms = ArmTerms(
+            initial_rate=self.arm_initial_rate,
+            fixed_months=self.arm_fixed_years * 12,
+            margin=self.arm_margin,
+            initial_cap=self.arm_initial_cap,
+            periodic_cap=self.arm_periodic_cap,
+            lifetime_cap=self.arm_lifetime_cap,
+        )
+        months = self.loan_term_years * 12
+        index_path = self.arm_index_rate + self.arm_index_change * np.arange(months) / 12
+        paths = arm_paths(self.loan_amount, self.loan_term_years, terms, index_path)
         
-        # Return CSV file for download
-        return rx.download(csv_string, filename="amortization_schedule.csv")
+        self.arm_initial_payment = round(float(paths.payments[0, 0]), 2)
+        self.arm_max_payment = round(float(paths.payments[0].max()), 2)
+        self.arm_total_interest = round(float(paths.total_interest[0]), 2)
+        self.arm_resets = [
+            {"month": int(month) + 1, "rate": round(float(paths.rates[0, month]), 3), "payment": round(float(paths.payments[0, month]), 2)}
+            for month in terms.reset_schedule(months)
+        ]
+
 
+class SimulationState(State):
+    """Monte Carlo distribution of outcomes for the current loan under random rates and prepayments."""
+    
+    # Simulation inputs; a fixed period as long as the term simulates a fixed-rate loan
+    sim_paths: int = 10000
+    sim_seed: int = 42
+    sim_fixed_years: int = 5
+    sim_index_rate: float = 3.0
+    sim_volatility: float = 1.0
+    
+    # One row per percentile of total interest, payment shock and payoff month
+    sim_percentiles: List[Dict[str, Any]] = []
+    sim_running: bool = False
+    sim_progress: int = 0
+    sim_error: str = ""
+    
+    _number_inputs: ClassVar[Tuple[str, ...]] = (
+        "sim_paths", "sim_seed", "sim_fixed_years", "sim_index_rate", "sim_volatility"
+    )
+    
+    def update_input(self, field: str, value: str):
+        """Set one simulation input from its input field; partial or non-finite input is ignored."""
+        if field in self._number_inputs:
+            assign_number(self, field, value)
+    
+    def _simulation_spec(self) -> Optional[SimulationSpec]:
+        """Build the simulation from the inputs, or set ``sim_error`` and return None when they are invalid."""
+        if self.sim_fixed_years < 0:
+            self.sim_error = "The fixed period cannot be negative."
+            return None
+        if self.sim_seed < 0:
+            self.sim_error = "The seed must be zero or a positive whole number."
+            return None
+        self.sim_error = ""
+        return SimulationSpec(
+            principal=self.loan_amount,
+            years=self.loan_term_years,
+            terms=ArmTerms(initial_rate=self.annual_interest_rate, fixed_months=self.sim_fixed_years * 12),
+            rate_model=RateModel(start=self.sim_index_rate, volatility=self.sim_volatility),
+            paths=max(1, min(self.sim_paths, MAX_SIMULATION_PATHS)),
+            seed=self.sim_seed,
+        )
+    
+    @rx.event(background=True)
+    async def run_simulation(self):
+        """Simulate the current loan in the process pool, reporting progress as chunks finish."""
+        async with self:
+            if self.sim_running or not self._inputs_valid():
+                return
+            spec = self._simulation_spec()
+            if spec is None:
+                return
+            self.sim_running = True
+            self.sim_progress = 0
+        
+        results = []
+        try:
+            async for paths_done, result in simulate_loan_in_pool(spec):
+                results.append(result)
+                async with self:
+                    self.sim_progress = round(100 * paths_done / spec.paths)
+        except ValueError as error:
+            results = []
+            async with self:
+                self.sim_error = str(error)
+        finally:
+            async with self:
+                self.sim_running = False
+        
+        if not results:
+            return
+        percentiles = SimulationResult.concatenate(results).percentiles()
+        async with self:
+            self.sim_percentiles = [
+                {
+                    "percentile": row["percentile"],
+                    "total_interest": round(row["total_interest"], 2),
+                    "payment_shock": round(row["payment_shock"], 3),
+                    "payoff_month": int(row["payoff_month"]),
+                }
+                for row in percentiles
+            ]
 
-def index() -> rx.Component:
-    from real_estate_reflex.pages.home import index as home_index
-    return home_index()
 
-def amortization_page() -> rx.Component:
-    from real_estate_reflex.pages.amortization import index
-    return index()
+class PortfolioState(State):
+    """Portfolio import and background job progress, kept out of the root state."""
+    
+    # Portfolio import results
+    portfolio_loan_count: int = 0
+    portfolio_skipped_rows: int = 0
+    portfolio_total_principal: float = 0.0
+    portfolio_total_interest: float = 0.0
+    portfolio_total_payment: float = 0.0
+    portfolio_months: int = 0
+    portfolio_summary_file: str = ""
+    portfolio_runoff_file: str = ""
+    portfolio_error: str = ""
+    _portfolio_loans_path: str = ""
+    
+    # Progress of the session's background job (portfolio runs)
+    job_running: bool = False
+    job_progress: int = 0
+    job_status: str = ""
+    job_cancel_requested: bool = False
     
-def comparison_page() -> rx.Component:
-    from real_estate_reflex.pages.comparison import index
-    return index()
+    async def handle_portfolio_upload(self, files: List[rx.UploadFile]):
+        """Save an uploaded CSV or Parquet loan book and start amortizing it in the background."""
+        if not files or self.job_running:
+            return
+        upload = files[0]
+        suffix = Path(upload.filename or "").suffix.lower()
+        if suffix not in (".csv", ".parquet", ".pq"):
+            self.portfolio_error = "Upload a .csv or .parquet loan file."
+            return
+        
+        # Copy the upload to disk in blocks so large books never sit in memory
+        upload_dir = rx.get_upload_dir()
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        self._portfolio_loans_path = str(upload_dir / f"portfolio_{self.router.session.client_token}_loans{suffix}")
+        with open(self._portfolio_loans_path, "wb") as loans_out:
+            while block := await upload.read(1024 * 1024):
+                loans_out.write(block)
+        
+        self.portfolio_error = ""
+        self.portfolio_loan_count = 0
+        return PortfolioState.run_portfolio_job
+    
+    @rx.event(background=True)
+    async def run_portfolio_job(self):
+        """Amortize the uploaded loan book in the process pool, reporting progress as chunks finish."""
+        async with self:
+            if self.job_running:
+                return
+            loans_path = Path(self._portfolio_loans_path)
+            file_stem = f"portfolio_{self.router.session.client_token}"
+            self.job_running = True
+            self.job_cancel_requested = False
+            self.job_progress = 0
+            self.job_status = "Amortizing portfolio"
+        
+        summary_file = f"{file_stem}_summary.csv"
+        runoff_file = f"{file_stem}_runoff.csv"
+        upload_dir = rx.get_upload_dir()
+        totals = None
+        try:
+            total_rows = max(await asyncio.to_thread(count_loan_rows, loans_path), 1)
+            with open(upload_dir / summary_file, "w", newline="") as summary_out:
+                async for rows_done, totals in amortize_portfolio_in_pool(loans_path, summary_out):
+                    async with self:
+                        self.job_progress = min(100, round(100 * rows_done / total_rows))
+                        if self.job_cancel_requested:
+                            totals = None
+                            self.job_status = "Portfolio run cancelled"
+                            break
+            if totals is not None:
+                with open(upload_dir / runoff_file, "w", newline="") as runoff_out:
+                    write_runoff(totals, runoff_out)
+        except (ValueError, ImportError) as error:
+            async with self:
+                self.portfolio_error = str(error)
+            totals = None
+        finally:
+            loans_path.unlink(missing_ok=True)
+            async with self:
+                self.job_running = False
+        
+        if totals is None:
+            return
+        async with self:
+            self.job_status = "Portfolio run complete"
+            self.portfolio_loan_count = totals.loan_count
+            self.portfolio_skipped_rows = totals.skipped_rows
+            self.portfolio_total_principal = round(totals.total_principal, 2)
+            self.portfolio_total_interest = round(totals.total_interest, 2)
+            self.portfolio_total_payment = round(totals.total_payment, 2)
+            self.portfolio_months = totals.months
+            self.portfolio_summary_file = summary_file
+            self.portfolio_runoff_file = runoff_file
+    
+    def cancel_job(self):
+        """Ask the running background job to stop after its current chunk."""
+        if self.job_running:
+            self.job_cancel_requested = True
+
+
+def warm_up():
+    """Load plotly's figure validators and cache the default loan before the worker's first event."""
+    fields = State.get_fields()
+    key = normalize_loan_key(
+        *(fields[name].default for name in ("loan_amount", "annual_interest_rate", "loan_term_years"))
+    )
+    cached_loan_summary(*key)
+    series = cached_chart_series(*key)
+    principal_interest_figure(series)
+    balance_figure(series)
+    empty_figure()
+
+# The page modules import the states above, so they are imported once those exist.
+# Each page function is evaluated once when the app is compiled.
+from real_estate_reflex.pages.amortization import amortization  # noqa: E402
+from real_estate_reflex.pages.comparison import comparison  # noqa: E402
+from real_estate_reflex.pages.home import index  # noqa: E402
+from real_estate_reflex.pages.portfolio import portfolio  # noqa: E402
 
 # Create the app
-app = rx.App()
+app = rx.App(api_transformer=api)
+app.register_lifespan_task(warm_up)
+app.register_lifespan_task(process_pool_lifespan)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware())
 app.add_page(index)
-app.add_page(amortization_page, route="/amortization")
-app.add_page(comparison_page, route="/comparison")
+app.add_page(amortization, route="/amortization", on_load=ScheduleState.load_schedule)
+app.add_page(comparison, route="/comparison")
+app.add_page(portfolio, route="/portfolio")
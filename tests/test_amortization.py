@@ -0,0 +1,110 @@
+"""The closed-form amortization engine against the loop it replaced."""
+
+import numpy as np
+import pytest
+
+from real_estate_reflex.engine.amortization import SCHEDULE_COLUMNS, amortization_schedule, monthly_payment
+from real_estate_reflex.engine.cache import cached_loan_summary
+from real_estate_reflex.engine.table import ScheduleIndex, parse_month_range
+
+LOANS = [
+    (250000.0, 5.0, 30),
+    (300000.0, 0.0, 30),
+    (18000.0, 0.0, 1),
+    (50000.0, 4.5, 1),
+    (900000.0, 7.25, 50),
+    (1.0, 0.01, 50),
+]
+
+
+def baseline_schedule(loan_amount, annual_interest_rate, loan_term_years):
+    """The original ``State.calculate_loan`` loop, kept verbatim as the reference."""
+    payment = monthly_payment(loan_amount, annual_interest_rate, loan_term_years)
+    monthly_rate = annual_interest_rate / 100 / 12
+    amortization_data = []
+    remaining_balance = loan_amount
+    total_interest = 0
+
+    for month in range(1, loan_term_years * 12 + 1):
+        interest_payment = remaining_balance * monthly_rate
+        principal_payment = payment - interest_payment
+        total_interest += interest_payment
+        remaining_balance -= principal_payment
+
+        # Handle final payment rounding issues
+        if month == loan_term_years * 12:
+            principal_payment += remaining_balance
+            remaining_balance = 0
+
+        amortization_data.append({
+            "month": month,
+            "starting_balance": round(remaining_balance + principal_payment, 2),
+            "payment": round(payment, 2),
+            "principal": round(principal_payment, 2),
+            "interest": round(interest_payment, 2),
+            "ending_balance": round(remaining_balance, 2)
+        })
+
+    return amortization_data, round(total_interest, 2), round(loan_amount + total_interest, 2)
+
+
+@pytest.mark.parametrize("loan", LOANS)
+def test_schedule_matches_the_baseline_loop(loan):
+    expected_rows, expected_interest, expected_payment = baseline_schedule(*loan)
+    schedule = amortization_schedule(*loan)
+    rows = schedule.to_rows()
+
+    assert len(rows) == len(expected_rows) == loan[2] * 12
+    assert round(schedule.total_interest, 2) == expected_interest
+    assert round(loan[0] + schedule.total_interest, 2) == expected_payment
+    for column in SCHEDULE_COLUMNS:
+        actual = np.array([row[column] for row in rows])
+        expected = np.array([row[column] for row in expected_rows])
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=0.01 + 1e-9, err_msg=column)
+    assert rows[-1]["ending_balance"] == 0.0
+
+
+@pytest.mark.parametrize("loan", LOANS)
+def test_state_totals_match_the_baseline_loop(loan):
+    _, expected_interest, expected_payment = baseline_schedule(*loan)
+    payment, total_interest, total_payment = cached_loan_summary(*loan)
+    assert payment == monthly_payment(*loan)
+    assert round(total_interest, 2) == expected_interest
+    assert round(total_payment, 2) == expected_payment
+
+
+def test_schedule_columns_are_read_only():
+    schedule = amortization_schedule(250000.0, 5.0, 30)
+    with pytest.raises(ValueError):
+        schedule.interest[0] = 0.0
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", (1, 360)),
+    ("12", (12, 12)),
+    ("24-12", (12, 24)),
+    ("0-400", (1, 360)),
+    ("twelve", None),
+])
+def test_parse_month_range(text, expected):
+    assert parse_month_range(text, 360) == expected
+
+
+@pytest.mark.parametrize("column", SCHEDULE_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_index_selects_the_month_range_in_sort_order(column, descending):
+    schedule = amortization_schedule(250000.0, 5.0, 30)
+    positions = ScheduleIndex(schedule).select(column, descending, (13, 24))
+
+    assert sorted(positions.tolist()) == list(range(12, 24))
+    values = np.array([row[column] for row in schedule.rows_at(positions)])
+    steps = np.diff(values)
+    assert (steps <= 0).all() if descending else (steps >= 0).all()
+
+
+def test_index_selects_nothing_for_an_invalid_range():
+    index = ScheduleIndex(amortization_schedule(250000.0, 5.0, 30))
+    assert len(index.select("month", False, None)) == 0
+    assert index.select("month", False, (1, 360)).tolist() == list(range(360))
+    with pytest.raises(ValueError):
+        index.select("balance", False, (1, 360))
@@ -0,0 +1,37 @@
+"""The batch loan engine against the single-loan engine."""
+
+import numpy as np
+
+from real_estate_reflex.engine.amortization import amortization_schedule, monthly_payment
+from real_estate_reflex.engine.batch import balance_curves, batch_monthly_payment, loan_summaries
+
+PRINCIPALS = [250000.0, 300000.0, 18000.0, 900000.0, 50000.0]
+RATES = [5.0, 0.0, 0.0, 7.25, 4.5]
+YEARS = [30, 15, 1, 50, 1]
+
+
+def test_summaries_with_zero_rates_and_mixed_terms():
+    summaries = loan_summaries(PRINCIPALS, RATES, YEARS)
+    assert len(summaries) == 5
+    for row, loan in enumerate(zip(PRINCIPALS, RATES, YEARS)):
+        schedule = amortization_schedule(*loan)
+        assert summaries.monthly_payment[row] == monthly_payment(*loan)
+        np.testing.assert_allclose(summaries.total_interest[row], schedule.total_interest, rtol=1e-12, atol=1e-6)
+        np.testing.assert_allclose(summaries.total_payment[row], loan[0] + schedule.total_interest, rtol=1e-12)
+    # Zero-rate loans repay exactly their principal
+    assert summaries.total_interest[1] == 0.0 and summaries.total_interest[2] == 0.0
+
+
+def test_scalar_inputs_broadcast():
+    payments = batch_monthly_payment(PRINCIPALS, 5.0, 30)
+    np.testing.assert_allclose(payments, [monthly_payment(principal, 5.0, 30) for principal in PRINCIPALS], rtol=1e-12)
+
+
+def test_balance_curves_match_schedules_and_end_at_zero():
+    months = np.arange(1, 601)
+    curves = balance_curves(PRINCIPALS, RATES, YEARS, months)
+    assert curves.shape == (5, 600)
+    for row, loan in enumerate(zip(PRINCIPALS, RATES, YEARS)):
+        schedule = amortization_schedule(*loan)
+        np.testing.assert_allclose(curves[row, :len(schedule)], schedule.ending_balance, rtol=0, atol=1e-6)
+        assert (curves[row, len(schedule):] == 0.0).all()
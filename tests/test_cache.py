@@ -0,0 +1,55 @@
+"""Bounds and counters of the process-wide LRU caches."""
+
+import numpy as np
+
+from real_estate_reflex.engine.cache import LRUCache
+
+
+def test_evicts_the_least_recently_used_entry_by_count():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes_but_keeps_the_newest_entry():
+    cache = LRUCache(max_entries=100, max_bytes=2000)
+    for key in range(3):
+        cache.put(key, np.zeros(100))  # 800 bytes each
+    assert len(cache) == 2 and cache.get(0) is None
+    assert cache.stats()["bytes"] == 1600
+
+    # An entry over the byte budget on its own still stays, alone
+    cache.put("large", np.zeros(1000))
+    assert len(cache) == 1 and cache.get("large") is not None
+    assert cache.stats()["bytes"] == 8000
+
+
+def test_replacing_a_key_keeps_the_byte_count():
+    cache = LRUCache()
+    cache.put("a", np.zeros(10))
+    cache.put("a", np.zeros(20))
+    assert len(cache) == 1 and cache.stats()["bytes"] == 160
+
+
+def test_counters():
+    cache = LRUCache()
+    calls = []
+    compute = lambda: calls.append(1) or "value"  # noqa: E731
+    assert cache.get_or_compute("a", compute) == "value"
+    assert cache.get_or_compute("a", compute) == "value"
+    assert cache.get("missing") is None
+    assert cache.peek("a") == "value" and cache.peek("missing") is None
+
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["hit_rate"] == 1 / 3
+
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
@@ -0,0 +1,39 @@
+"""Shape-preserving downsampling of chart series."""
+
+import numpy as np
+import pytest
+
+from real_estate_reflex.engine.amortization import amortization_schedule
+from real_estate_reflex.engine.charts import CHART_MAX_POINTS, lttb_indices, schedule_chart_series
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 200, 599])
+def test_keeps_the_endpoints(threshold):
+    x = np.arange(600)
+    y = np.sin(x / 20.0)
+    indices = lttb_indices(x, y, threshold)
+    assert len(indices) == threshold
+    assert indices[0] == 0 and indices[-1] == 599
+    assert (np.diff(indices) > 0).all()
+
+
+def test_keeps_a_spike():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 100.0
+    assert 437 in lttb_indices(x, y, 50)
+
+
+@pytest.mark.parametrize("threshold", [2, 12, 1000])
+def test_short_series_and_tiny_thresholds_are_kept_whole(threshold):
+    x = np.arange(12)
+    assert lttb_indices(x, x * 2.0, threshold).tolist() == list(range(12))
+
+
+def test_schedule_series_stay_within_the_point_budget():
+    schedule = amortization_schedule(250000.0, 5.0, 50)
+    series = schedule_chart_series(schedule)
+    for months, values in series.values():
+        assert len(months) == len(values) == CHART_MAX_POINTS
+        assert months[0] == 1 and months[-1] == 600
+    assert series["balance"][1][-1] == 0.0
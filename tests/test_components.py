@@ -0,0 +1,85 @@
+"""Page components build against the pinned Reflex, and their inputs reach the state."""
+
+import pytest
+import reflex as rx
+
+# The app module first, as Reflex loads it; it imports the pages, which import these components
+from real_estate_reflex.real_estate_reflex import ArmState, PrepaymentState, ScheduleState, SimulationState, State
+from real_estate_reflex.components.input_form import (
+    affordability_estimator,
+    arm_form,
+    prepayment_form,
+    scenario_comparison,
+    simulation_form,
+)
+from real_estate_reflex.pages.amortization import amortization
+from real_estate_reflex.pages.comparison import comparison
+from real_estate_reflex.pages.home import index
+from real_estate_reflex.pages.portfolio import portfolio
+
+
+def substate(state_class):
+    """A detached substate, as the app would create per session."""
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(state_class.get_full_name().split(".")[1:])
+
+
+@pytest.mark.parametrize("component", [
+    index,
+    amortization,
+    comparison,
+    portfolio,
+    affordability_estimator,
+    prepayment_form,
+    arm_form,
+    simulation_form,
+    scenario_comparison,
+])
+def test_component_renders(component):
+    assert component().render()
+
+
+def test_number_inputs_keep_their_field_types():
+    arm = substate(ArmState)
+    arm.update_input("arm_margin", "3.125")
+    arm.update_input("arm_fixed_years", "7")
+    assert arm.arm_margin == 3.125
+    assert arm.arm_fixed_years == 7 and isinstance(arm.arm_fixed_years, int)
+
+    simulation = substate(SimulationState)
+    simulation.update_input("sim_paths", "2500")
+    assert simulation.sim_paths == 2500
+
+
+@pytest.mark.parametrize("value", ["", "-", "1e", "nan", "inf"])
+def test_partial_or_non_finite_input_is_ignored(value):
+    prepayment = substate(PrepaymentState)
+    prepayment.update_input("extra_monthly_payment", "150")
+    prepayment.update_input("extra_monthly_payment", value)
+    assert prepayment.extra_monthly_payment == 150.0
+
+    state = substate(State)
+    state.update_desired_monthly_payment("1800")
+    state.update_desired_monthly_payment(value)
+    assert state.desired_monthly_payment == 1800.0
+
+
+def test_whole_number_fields_reject_fractions_and_unknown_fields_are_ignored():
+    simulation = substate(SimulationState)
+    simulation.update_input("sim_seed", "4.5")
+    assert simulation.sim_seed == 42
+
+    simulation.update_input("sim_running", "1")
+    assert simulation.sim_running is False
+
+
+def test_interest_principal_chart_waits_for_the_charts_and_follows_the_totals():
+    schedule = substate(ScheduleState)
+    assert not schedule.interest_principal_chart.data
+
+    schedule.calculate_loan()
+    assert not schedule.interest_principal_chart.data
+
+    schedule.show_charts()
+    (pie,) = schedule.interest_principal_chart.data
+    assert list(pie.values) == [schedule.loan_amount, schedule.total_interest]
@@ -0,0 +1,30 @@
+"""The CSV download event sent by the schedule page."""
+
+import reflex as rx
+from reflex.event import fix_events
+
+from real_estate_reflex.api import CSV_DOWNLOAD_ROUTE
+from real_estate_reflex.real_estate_reflex import State
+
+
+def root_state() -> State:
+    """A detached root State, as the app would create per session."""
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(State.get_full_name().split(".")[1:])
+
+
+def test_download_csv_needs_a_calculated_loan():
+    assert root_state().download_csv() is None
+
+
+def test_download_csv_points_at_the_backend_export_route():
+    state = root_state()
+    state.calculate_loan()
+    event = fix_events([state.download_csv()], token="token")[0]
+
+    assert event.name == "_download"
+    assert event.payload["filename"] == "amortization_schedule.csv"
+    url = event.payload["url"]
+    # Resolved against the backend origin in the browser, not the frontend's
+    assert "getBackendURL(env.UPLOAD)" in url
+    assert f"{CSV_DOWNLOAD_ROUTE}?principal=250000.0&rate=5.0&years=30" in url
@@ -0,0 +1,118 @@
+"""Prepayment schedules and the incremental recompute of their tails."""
+
+import numpy as np
+import pytest
+
+from real_estate_reflex.engine import cache
+from real_estate_reflex.engine.amortization import monthly_payment
+from real_estate_reflex.engine.prepayment import (
+    PAID_OFF_BALANCE,
+    Prepayment,
+    extra_payments,
+    parse_lump_sums,
+    prepayment_schedule,
+)
+
+LOAN = (300000.0, 6.0, 30)
+BASE = (Prepayment(200.0, month=1, every=1), Prepayment(10000.0, month=60))
+
+
+def reference_schedule(principal, annual_rate, years, prepayments):
+    """Month-by-month amortization with extra payments, as the closed-form segments must reproduce."""
+    months = years * 12
+    monthly_rate = annual_rate / 100 / 12
+    payment = monthly_payment(principal, annual_rate, years)
+    extra = extra_payments(prepayments, months)
+    balance = principal
+    rows = []
+    for month in range(months):
+        interest = balance * monthly_rate
+        paid = payment + extra[month]
+        ending_balance = balance + interest - paid
+        if ending_balance < PAID_OFF_BALANCE or month == months - 1:
+            paid, ending_balance = balance + interest, 0.0
+        rows.append((paid - interest, interest, ending_balance, paid))
+        balance = ending_balance
+        if balance == 0.0:
+            break
+    return np.array(rows).T
+
+
+def assert_same_schedule(actual, expected):
+    assert len(actual.schedule) == len(expected.schedule)
+    for column in ("principal", "interest", "ending_balance", "payment"):
+        np.testing.assert_allclose(
+            getattr(actual.schedule, column), getattr(expected.schedule, column), rtol=0, atol=1e-6
+        )
+    assert actual.schedule.total_interest == pytest.approx(expected.schedule.total_interest, abs=1e-6)
+
+
+@pytest.mark.parametrize("loan", [LOAN, (300000.0, 0.0, 30), (50000.0, 4.5, 1), (900000.0, 7.25, 50)])
+@pytest.mark.parametrize("prepayments", [
+    (),
+    BASE,
+    (Prepayment(1000.0, month=12, every=12, until=240), Prepayment(25000.0, month=36)),
+    (Prepayment(10_000_000.0, month=3),),  # pays the loan off early in a single month
+])
+def test_matches_a_month_by_month_loop(loan, prepayments):
+    schedule = prepayment_schedule(*loan, prepayments).schedule
+    expected = reference_schedule(*loan, prepayments)
+    assert len(schedule) == expected.shape[1]
+    # Within 1e-8 of the loan amount: the loop's own rounding reaches about 1e-7 dollars on large loans
+    tolerance = 1e-8 * loan[0]
+    for column, reference in zip(("principal", "interest", "ending_balance", "payment"), expected):
+        np.testing.assert_allclose(getattr(schedule, column), reference, rtol=0, atol=tolerance)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", []),
+    ("60:10000, 120:5000", [Prepayment(10000.0, month=60), Prepayment(5000.0, month=120)]),
+    ("60:10000; 120:5000", [Prepayment(10000.0, month=60), Prepayment(5000.0, month=120)]),
+])
+def test_parse_lump_sums(text, expected):
+    assert parse_lump_sums(text) == expected
+
+
+@pytest.mark.parametrize("text", ["60", "x:100", "0:100", "60:-1", "60:nan", "60:inf", "60:-inf", "inf"])
+def test_parse_lump_sums_rejects_malformed_text(text):
+    assert parse_lump_sums(text) is None
+
+
+@pytest.mark.parametrize("changed", [
+    BASE + (Prepayment(5000.0, month=120),),  # a new lump sum
+    BASE[:1],  # a lump sum removed, in the middle of a constant-payment run
+    (Prepayment(200.0, month=1, every=1, until=90), BASE[1]),  # a recurring extra stopped early
+    (Prepayment(200.0, month=1, every=1), Prepayment(15000.0, month=60)),  # a lump sum changed
+])
+def test_tail_recompute_matches_a_full_rebuild(changed):
+    previous = prepayment_schedule(*LOAN, BASE)
+    incremental = prepayment_schedule(*LOAN, changed, previous=previous)
+    assert_same_schedule(incremental, prepayment_schedule(*LOAN, changed))
+
+
+def test_months_before_the_change_are_reused():
+    previous = prepayment_schedule(*LOAN, BASE)
+    result = prepayment_schedule(*LOAN, BASE + (Prepayment(5000.0, month=120),), previous=previous)
+    np.testing.assert_array_equal(result.schedule.ending_balance[:119], previous.schedule.ending_balance[:119])
+    assert result.schedule.ending_balance[119] < previous.schedule.ending_balance[119]
+
+
+def test_a_change_after_payoff_keeps_the_previous_schedule():
+    previous = prepayment_schedule(*LOAN, BASE)
+    late = Prepayment(5000.0, month=previous.payoff_month + 10)
+    result = prepayment_schedule(*LOAN, BASE + (late,), previous=previous)
+    assert result.schedule is previous.schedule
+    assert result.extra[late.month - 1] == 5200.0
+
+
+def test_cached_schedule_recomputes_from_the_previous_key():
+    cache.prepayment_cache.clear()
+    previous_key = cache.prepayment_cache_key(*LOAN, BASE)
+    previous = cache.cached_prepayment_schedule(*LOAN, BASE)
+    changed = BASE + (Prepayment(5000.0, month=120),)
+    result = cache.cached_prepayment_schedule(*LOAN, changed, previous_key=previous_key)
+
+    np.testing.assert_array_equal(result.schedule.interest[:119], previous.schedule.interest[:119])
+    assert_same_schedule(result, prepayment_schedule(*LOAN, changed))
+    # Looking up the previous result is not counted as a cache hit
+    assert cache.prepayment_cache.stats()["hits"] == 0
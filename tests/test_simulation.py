@@ -0,0 +1,47 @@
+"""Edge cases of the Monte Carlo simulation and its state handler."""
+
+import numpy as np
+import reflex as rx
+
+from real_estate_reflex.engine.arm import ArmTerms
+from real_estate_reflex.engine.simulation import SimulationSpec, simulate_loan
+from real_estate_reflex.real_estate_reflex import SimulationState
+
+
+def simulation_state() -> SimulationState:
+    """A detached SimulationState, as the app would create per session."""
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(SimulationState.get_full_name().split(".")[1:])
+
+
+def test_zero_fixed_years_simulates_from_the_first_month():
+    spec = SimulationSpec(principal=250000.0, years=30, terms=ArmTerms(initial_rate=5.0, fixed_months=0), paths=200)
+    result = simulate_loan(spec)
+    assert np.isfinite(result.payment_shock).all()
+    assert (result.total_interest > 0).all()
+
+
+def test_zero_fixed_years_is_accepted_by_the_state():
+    state = simulation_state()
+    state.sim_fixed_years = 0
+    spec = state._simulation_spec()
+    assert spec is not None and spec.terms.fixed_months == 0
+    assert state.sim_error == ""
+
+
+def test_negative_fixed_years_sets_an_error():
+    state = simulation_state()
+    state.sim_fixed_years = -1
+    assert state._simulation_spec() is None
+    assert state.sim_error
+
+
+def test_negative_seed_sets_an_error_instead_of_raising():
+    state = simulation_state()
+    state.sim_seed = -1
+    assert state._simulation_spec() is None
+    assert state.sim_error
+
+    state.sim_seed = 7
+    assert state._simulation_spec().seed == 7
+    assert state.sim_error == ""
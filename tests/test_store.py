@@ -0,0 +1,132 @@
+"""The shared result store: its encoding and the caches reading through it."""
+
+import numpy as np
+import pytest
+
+from real_estate_reflex.engine import cache
+from real_estate_reflex.engine.amortization import amortization_schedule
+from real_estate_reflex.engine.prepayment import Prepayment, prepayment_schedule
+from real_estate_reflex.engine.store import (
+    InMemoryRedis,
+    RedisResultBackend,
+    decode_schedule,
+    decode_summary,
+    encode_schedule,
+    encode_summary,
+)
+
+LOANS = ([250000.0, 400000.0, 90000.0], [5.0, 0.0, 7.5], [30, 15, 1])
+
+
+class CountingRedis(InMemoryRedis):
+    """In-memory client that counts round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {"get": 0, "mget": 0, "set": 0}
+
+    def get(self, name):
+        self.calls["get"] += 1
+        return super().get(name)
+
+    def mget(self, names):
+        self.calls["mget"] += 1
+        return super().mget(names)
+
+    def set(self, name, value, ex=None):
+        self.calls["set"] += 1
+        return super().set(name, value, ex=ex)
+
+
+class UnavailableRedis:
+    """Client for a Redis that cannot be reached."""
+
+    def mget(self, names):
+        raise ConnectionRefusedError("store unavailable")
+
+    def set(self, name, value, ex=None):
+        raise ConnectionRefusedError("store unavailable")
+
+
+def clear_local_caches():
+    for lru in cache.CACHES.values():
+        lru.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches():
+    clear_local_caches()
+    yield
+    cache.set_shared_backend(None)
+    clear_local_caches()
+
+
+@pytest.mark.parametrize("schedule", [
+    amortization_schedule(250000.0, 5.0, 30),
+    amortization_schedule(12000.0, 0.0, 1),
+    prepayment_schedule(300000.0, 6.0, 30, [Prepayment(10000.0, month=60)]).schedule,
+])
+def test_schedule_round_trip(schedule):
+    decoded = decode_schedule(encode_schedule(schedule))
+    assert decoded.monthly_payment == schedule.monthly_payment
+    assert decoded.total_interest == schedule.total_interest
+    assert (decoded.payments is None) == (schedule.payments is None)
+    for column in ("principal", "interest", "ending_balance", "payments"):
+        expected = getattr(schedule, column)
+        if expected is None:
+            continue
+        actual = getattr(decoded, column)
+        np.testing.assert_array_equal(actual, expected)
+        assert not actual.flags.writeable
+
+
+def test_decode_rejects_other_data():
+    with pytest.raises(ValueError):
+        decode_schedule(b"XXXX" + bytes(64))
+
+
+def test_summary_round_trip():
+    summary = (1342.05, 233139.46, 483139.46)
+    assert decode_summary(encode_summary(summary)) == summary
+
+
+def test_local_miss_reads_the_shared_store():
+    backend = RedisResultBackend(InMemoryRedis())
+    cache.set_shared_backend(backend)
+    computed = cache.cached_schedule(250000.0, 5.0, 30)
+    assert backend.stats() == {"hits": 0, "misses": 1, "errors": 0}
+
+    # Another worker: its local cache is empty, the store has the schedule
+    clear_local_caches()
+    stored = cache.cached_schedule(250000.0, 5.0, 30)
+    assert backend.stats() == {"hits": 1, "misses": 1, "errors": 0}
+    assert stored is not computed
+    np.testing.assert_array_equal(stored.ending_balance, computed.ending_balance)
+    assert not stored.ending_balance.flags.writeable
+
+
+def test_batch_summaries_use_one_round_trip():
+    client = CountingRedis()
+    backend = RedisResultBackend(client)
+    cache.set_shared_backend(backend)
+    computed = cache.cached_loan_summaries(*LOANS)
+    assert client.calls == {"get": 0, "mget": 1, "set": 3}
+
+    clear_local_caches()
+    client.calls.update(mget=0, set=0)
+    assert cache.cached_loan_summaries(*LOANS) == computed
+    assert client.calls == {"get": 0, "mget": 1, "set": 0}
+    assert backend.stats()["hits"] == 3
+
+
+def test_unavailable_store_degrades_to_local_compute():
+    backend = RedisResultBackend(UnavailableRedis())
+    cache.set_shared_backend(backend)
+
+    schedule = cache.cached_schedule(250000.0, 5.0, 30)
+    np.testing.assert_array_equal(schedule.ending_balance, amortization_schedule(250000.0, 5.0, 30).ending_balance)
+    assert backend.errors == 2  # the read and the write
+
+    summaries = cache.cached_loan_summaries(*LOANS)
+    assert len(summaries) == 3 and all(summary is not None for summary in summaries)
+    assert backend.errors == 2 + 1 + 3  # one batched read, one write per loan